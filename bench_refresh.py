@@ -0,0 +1,121 @@
+"""
+Benchmark the refresh pipeline offline against fake_github.py.
+
+    uv run python bench_refresh.py --repos 200 --commits 300 --latency 0.05 --rounds 3
+    uv run python bench_refresh.py --compare-clients 300
+"""
+import argparse
+import asyncio
+import socket
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+import httpx
+import uvicorn
+from fake_github import FakeGitHub, FakeGitHubConfig, create_app
+from github_client import GitHubClient
+from commit_agent import CommitAgent
+from board import Board
+
+
+@asynccontextmanager
+async def serve_fake_github(config: FakeGitHubConfig):
+    """
+    Run a fake GitHub API in this event loop.
+
+    Yields:
+        Tuple of (base URL, FakeGitHub serving it)
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    fake = FakeGitHub(config)
+    server = uvicorn.Server(uvicorn.Config(create_app(fake), host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}", fake
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def refresh(github: GitHubClient, agent: CommitAgent, limit: int | None) -> list:
+    """One dashboard refresh, as server.refresh_dashboard does it."""
+    agent.as_of = datetime.now()
+    repos = await github.get_repos(limit=limit)
+    await agent.sync_repos(repos)
+    return Board(repos, agent, as_of=agent.as_of).get_projects()
+
+
+async def bench(config: FakeGitHubConfig, rounds: int, limit: int | None, pushes: int) -> None:
+    """Run cold and warm refreshes and print latency and request counts."""
+    async with serve_fake_github(config) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False)
+
+            print(f"{'round':<8} {'seconds':>8} {'requests':>9} {'304s':>6} {'rows':>6}")
+            for n in range(rounds):
+                if n:
+                    # Simulate activity between refreshes
+                    for repo in fake.repos[:pushes]:
+                        fake.push(repo["name"])
+                requests, not_modified = fake.requests, fake.not_modified
+                start = time.perf_counter()
+                projects = await refresh(github, agent, limit)
+                elapsed = time.perf_counter() - start
+                label = "cold" if n == 0 else f"warm{n}"
+                print(f"{label:<8} {elapsed:>8.3f} {fake.requests - requests:>9} "
+                      f"{fake.not_modified - not_modified:>6} {len(projects):>6}")
+
+
+async def bench_clients(config: FakeGitHubConfig, requests: int) -> None:
+    """Compare a client built per request with GitHubClient's pooled one, on sequential GETs."""
+    async with serve_fake_github(config) as (base_url, fake):
+        start = time.perf_counter()
+        for _ in range(requests):
+            # What GitHubClient did before pooling: a new client (and connection) per call
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                (await client.get("/user")).raise_for_status()
+        per_call = (time.perf_counter() - start) / requests
+
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            start = time.perf_counter()
+            for _ in range(requests):
+                (await github._send("GET", "/user")).raise_for_status()
+            pooled = (time.perf_counter() - start) / requests
+
+    print(f"{'client':<10} {'ms/request':>11}")
+    print(f"{'per-call':<10} {per_call * 1000:>11.2f}")
+    print(f"{'pooled':<10} {pooled * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark refresh against a fake GitHub API")
+    parser.add_argument("--repos", type=int, default=30)
+    parser.add_argument("--commits", type=int, default=150)
+    parser.add_argument("--branches", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=15, help="Repos per refresh (0 for all)")
+    parser.add_argument("--pushes", type=int, default=2, help="Repos pushed to between rounds")
+    parser.add_argument("--compare-clients", type=int, default=0, metavar="N",
+                        help="Instead, time N sequential GETs with a per-call vs the pooled client")
+    args = parser.parse_args()
+
+    config = FakeGitHubConfig(
+        repos=args.repos,
+        commits=args.commits,
+        branches=args.branches,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    if args.compare_clients:
+        asyncio.run(bench_clients(config, args.compare_clients))
+    else:
+        asyncio.run(bench(config, args.rounds, args.limit or None, args.pushes))
@@ -1,8 +1,9 @@
 """
 Board - Dashboard computation and display logic.
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import TypedDict
+from commit_record import CommitRecord
 
 
 class ProjectRow(TypedDict):
@@ -40,53 +41,54 @@ class Board:
         Returns:
             List of ProjectRow dicts
         """
-        projects = []
-
-        for repo in self.repos:
-            repo_id = repo["id"]
-            commits = self.agent.get_commits(repo_id)
-
-            count_3d = self._count_commits_in_window(commits, days=3)
-            count_30d = self._count_commits_in_window(commits, days=30)
-
-            row: ProjectRow = {
-                "project": repo["name"],
-                "url": f"https://github.com/{repo['owner']}/{repo['name']}",
-                "commit_count_3d": count_3d,
-                "commit_count_30d": count_30d,
-                "language": repo["language"] or "N/A",
-                "working_state": self.agent.get_summary(repo_id),
-                "loc": 0,  # Placeholder for future implementation
-                "weight": 5 * count_3d + count_30d,
-            }
-            projects.append(row)
+        projects = [self.get_row(repo) for repo in self.repos]
 
         # Sort by weight (descending)
         projects.sort(key=lambda p: p["weight"], reverse=True)
 
         return projects
 
-    def _count_commits_in_window(self, commits: list[dict], days: int) -> int:
+    def get_row(self, repo: dict) -> ProjectRow:
+        """
+        Compute the dashboard row for a single project.
+
+        Args:
+            repo: Repo dict from GitHub
+
+        Returns:
+            ProjectRow dict
+        """
+        repo_id = repo["id"]
+        commits = self.agent.get_commits(repo_id)
+
+        count_3d = self._count_commits_in_window(commits, days=3)
+        count_30d = self._count_commits_in_window(commits, days=30)
+
+        return {
+            "project": repo["name"],
+            "url": f"https://github.com/{repo['owner']}/{repo['name']}",
+            "commit_count_3d": count_3d,
+            "commit_count_30d": count_30d,
+            "language": repo["language"] or "N/A",
+            "working_state": self.agent.get_summary(repo_id),
+            "loc": 0,  # Placeholder for future implementation
+            "weight": 5 * count_3d + count_30d,
+        }
+
+    def _count_commits_in_window(self, commits: list[CommitRecord], days: int) -> int:
         """
         Count commits within a time window.
 
         Args:
-            commits: List of commit dicts with "date" field
+            commits: List of CommitRecords (epoch timestamps)
             days: Number of days to look back from as_of
 
         Returns:
             Count of commits in the window
         """
-        cutoff = self.as_of - timedelta(days=days)
-        count = 0
-
-        for commit in commits:
-            # Parse ISO format date from GitHub
-            commit_date = datetime.fromisoformat(commit["date"].replace("Z", "+00:00"))
-            # Make as_of timezone-aware for comparison if needed
-            cutoff_aware = cutoff.replace(tzinfo=commit_date.tzinfo) if commit_date.tzinfo else cutoff
-
-            if commit_date >= cutoff_aware:
-                count += 1
-
-        return count
+        # as_of is compared as UTC, as it always has been; dates were parsed at ingest
+        cutoff = int((self.as_of - timedelta(days=days)).replace(tzinfo=timezone.utc).timestamp())
+        if hasattr(commits, "count_since"):
+            # Lazy or columnar commits: counted by the store without decoding them
+            return commits.count_since(cutoff)
+        return sum(1 for commit in commits if commit.epoch >= cutoff)
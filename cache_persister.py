@@ -0,0 +1,143 @@
+"""
+CachePersister - Write-behind saving of the CommitAgent cache.
+"""
+import asyncio
+import time
+from contextlib import suppress
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task (i.e. how long it was blocked)."""
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Initialize monitor.
+
+        Args:
+            interval: Seconds between probes
+        """
+        self.interval = interval
+        self.max_lag = 0.0  # Worst lag since start, seconds
+        self.window_max = 0.0  # Worst lag since the last reset_window()
+
+    async def run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - start - self.interval, 0.0)
+            self.max_lag = max(self.max_lag, lag)
+            self.window_max = max(self.window_max, lag)
+
+    def reset_window(self) -> float:
+        """Return the worst lag since the last call and start a new window."""
+        worst, self.window_max = self.window_max, 0.0
+        return worst
+
+
+class CachePersister:
+    """
+    Debounced, off-loop saving of a CommitAgent's cache.
+
+    mark_dirty() schedules a save `delay` seconds later; marks arriving
+    before it runs are coalesced into that one save. The store write runs
+    in a worker thread on a shallow snapshot of the cache, so the event
+    loop only pays for the copy. Saves are serialized, and flush() writes
+    whatever is pending (used on shutdown).
+    """
+
+    def __init__(self, agent, delay: float = 2.0):
+        """
+        Initialize persister.
+
+        Args:
+            agent: CommitAgent whose cache and store to persist
+            delay: Debounce window in seconds
+        """
+        self.agent = agent
+        self.delay = delay
+        self.monitor = LoopLagMonitor()
+        self.stats = {
+            "saves": 0,
+            "coalesced": 0,  # Marks absorbed by an already scheduled save
+            "errors": 0,
+            "last_save_seconds": None,  # Wall time of the last save, mostly off-loop
+            "last_snapshot_ms": None,  # Time the loop spent copying the cache
+            "last_save_loop_lag_ms": None,  # Worst loop stall while the last save ran
+        }
+        self._pending = False
+        self._task: asyncio.Task | None = None
+        self._monitor_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def start(self) -> None:
+        """Start measuring event-loop lag."""
+        self._monitor_task = asyncio.create_task(self.monitor.run())
+
+    def mark_dirty(self) -> None:
+        """Request a save; repeated calls within the debounce window share one write."""
+        if self._pending:
+            self.stats["coalesced"] += 1
+        self._pending = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.delay)
+            self._pending = False
+            # Shielded so a flush() cannot abandon a write mid-way in its thread
+            await asyncio.shield(self.save())
+
+    async def save(self) -> None:
+        """Write the repos marked dirty since the last save, in a worker thread."""
+        async with self._lock:
+            if not self.agent.dirty and not self.agent.summary_cache.dirty:
+                return
+
+            start = time.perf_counter()
+            # Entries are replaced, never mutated in place, so a shallow copy is a stable snapshot
+            changed, self.agent.dirty = self.agent.dirty, set()
+            cache = {repo_id: dict(entry) for repo_id, entry in self.agent.cache.items()}
+            summaries = self.agent.summary_cache.snapshot()
+            self.stats["last_snapshot_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+            self.monitor.reset_window()
+            try:
+                await asyncio.to_thread(self._write, cache, changed, summaries)
+            except Exception as e:
+                print(f"Cache save failed: {e}")
+                self.agent.dirty |= changed  # Retried with the next save
+                self.agent.summary_cache.dirty |= summaries is not None
+                self.stats["errors"] += 1
+                return
+            finally:
+                self.stats["last_save_loop_lag_ms"] = round(self.monitor.reset_window() * 1000, 2)
+            self.stats["saves"] += 1
+            self.stats["last_save_seconds"] = round(time.perf_counter() - start, 4)
+
+    def _write(self, cache: dict, changed: set[str], summaries: list | None) -> None:
+        if changed:
+            self.agent.store.save(cache, changed)
+        if summaries is not None:
+            self.agent.summary_cache.write(summaries)
+
+    async def flush(self) -> None:
+        """Save now, cancelling the debounce wait."""
+        self._pending = False
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        await self.save()
+
+    async def close(self) -> None:
+        """Flush pending changes and stop the lag monitor."""
+        await self.flush()
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._monitor_task
+
+    def status(self) -> dict:
+        """Persistence stats plus the worst event-loop lag seen so far."""
+        return {**self.stats, "pending": self._pending, "max_loop_lag_ms": round(self.monitor.max_lag * 1000, 2)}
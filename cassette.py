@@ -0,0 +1,172 @@
+"""
+Record/replay transports for GitHubClient.
+
+Record real API traffic once, then replay it offline and deterministically,
+either at full speed or with the original latencies:
+
+    uv run python cassette.py record refresh.cassette
+    uv run python cassette.py replay refresh.cassette [--realtime]
+"""
+import asyncio
+import base64
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+import httpx
+
+
+# Headers that describe the wire encoding, not the (already decoded) body
+WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+
+def _match_key(request: httpx.Request, ignore_params: tuple[str, ...]) -> tuple:
+    """
+    Key requests are matched on: method, URL and whether it is conditional.
+
+    Time-relative query params (since/until) are dropped so a cassette
+    recorded yesterday still matches today's requests.
+    """
+    params = sorted((k, v) for k, v in request.url.params.multi_items() if k not in ignore_params)
+    conditional = "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+    return request.method, request.url.host, request.url.path, tuple(params), conditional
+
+
+def _encode_body(content: bytes) -> dict:
+    try:
+        return {"text": content.decode()}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode()}
+
+
+def _decode_body(entry: dict) -> bytes:
+    if "base64" in entry:
+        return base64.b64decode(entry["base64"])
+    return entry.get("text", "").encode()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests to a real transport and records every exchange."""
+
+    def __init__(self, path: str, transport: httpx.AsyncBaseTransport | None = None):
+        """
+        Initialize recorder.
+
+        Args:
+            path: Cassette file to write (gzipped JSON lines) on close
+            transport: Transport that talks to the network (default: HTTP/2 pool)
+        """
+        self.path = path
+        self.transport = transport or httpx.AsyncHTTPTransport(http2=True)
+        self.interactions: list[dict] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        elapsed = time.perf_counter() - start
+
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in WIRE_HEADERS]
+        self.interactions.append({
+            "method": request.method,
+            "url": str(request.url),
+            "conditional": "If-None-Match" in request.headers or "If-Modified-Since" in request.headers,
+            "request_body": _encode_body(request.content) if request.content else None,
+            "status": response.status_code,
+            "headers": headers,
+            "body": _encode_body(content),
+            "elapsed": round(elapsed, 4),
+        })
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+        self.save()
+
+    def save(self) -> None:
+        """Write the recorded exchanges, one compact JSON object per line."""
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+        print(f"Recorded {len(self.interactions)} requests to {self.path}")
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves recorded responses without touching the network."""
+
+    def __init__(self, path: str, realtime: bool = False, ignore_params: tuple[str, ...] = ("since", "until")):
+        """
+        Load a cassette.
+
+        Args:
+            path: Cassette file written by RecordingTransport
+            realtime: Sleep for each exchange's recorded latency
+            ignore_params: Query params left out when matching requests
+        """
+        self.realtime = realtime
+        self.ignore_params = ignore_params
+        self.queues: dict[tuple, deque] = defaultdict(deque)
+        self.last: dict[tuple, dict] = {}
+        self.replayed = 0
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                interaction = json.loads(line)
+                request = httpx.Request(interaction["method"], interaction["url"])
+                if interaction["conditional"]:
+                    request.headers["If-None-Match"] = "*"
+                self.queues[_match_key(request, ignore_params)].append(interaction)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _match_key(request, self.ignore_params)
+        queue = self.queues.get(key)
+        if queue:
+            interaction = queue.popleft()
+            self.last[key] = interaction
+        elif key in self.last:
+            interaction = self.last[key]  # Replayed past the recording: repeat the last answer
+        else:
+            raise httpx.ConnectError(f"No recorded response for {request.method} {request.url}", request=request)
+
+        if self.realtime:
+            await asyncio.sleep(interaction["elapsed"])
+        self.replayed += 1
+        return httpx.Response(
+            interaction["status"],
+            headers=interaction["headers"],
+            content=_decode_body(interaction["body"]),
+            request=request,
+        )
+
+
+async def _run(mode: str, path: str, realtime: bool, limit: int) -> None:
+    """Run one refresh, recording or replaying, and report its duration."""
+    from datetime import datetime
+    from bench_refresh import refresh
+    from github_client import GitHubClient
+    from commit_agent import CommitAgent
+
+    if mode == "record":
+        transport = RecordingTransport(path)
+    else:
+        transport = ReplayTransport(path, realtime=realtime)
+
+    async with GitHubClient(transport=transport) as github:
+        agent = CommitAgent(github, as_of=datetime.now(), summarize=False)
+        start = time.perf_counter()
+        projects = await refresh(github, agent, limit)
+        elapsed = time.perf_counter() - start
+    print(f"{mode}: {len(projects)} projects in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record or replay a dashboard refresh")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("path", help="Cassette file")
+    parser.add_argument("--realtime", action="store_true", help="Replay with the recorded latencies")
+    parser.add_argument("--limit", type=int, default=15, help="Repos per refresh")
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.mode, args.path, args.realtime, args.limit))
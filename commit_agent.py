@@ -1,11 +1,20 @@
 """
 CommitAgent - Manages commit caching and AI summary generation.
 """
-import json
+import asyncio
+import itertools
+import httpx
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 from pydantic import BaseModel, Field
 from polycli import PolyAgent
+from commit_record import CommitRecord, as_record, parse_epoch
+from commit_store import CommitStore, JsonCommitStore
+from summary_cache import SummaryCache
+from summary_queue import SummaryQueue
+
+
+# Longest Board scoring window; older commits are not fetched or kept
+WINDOW_DAYS = 30
 
 
 class CommitSummary(BaseModel):
@@ -14,20 +23,70 @@ class CommitSummary(BaseModel):
     focus_areas: list[str] = Field(description="Key areas being worked on (max 3 items)")
 
 
+class RepoCommitSummary(CommitSummary):
+    """CommitSummary of one repository in a batched request."""
+    repo: str = Field(description="The repository's id: the number in brackets before its name")
+
+
+class CommitSummaryBatch(BaseModel):
+    """Structured summaries of several repositories' recent commits."""
+    summaries: list[RepoCommitSummary] = Field(description="One entry per repository")
+
+
 class CommitAgent:
     """Orchestrates commit fetching, caching, and AI summarization."""
 
-    def __init__(self, github_client, as_of: datetime | None = None):
+    def __init__(
+        self,
+        github_client,
+        as_of: datetime | None = None,
+        summarize: bool = True,
+        store: CommitStore | None = None,
+        max_repos: int | None = None,
+        max_commits: int | None = None,
+        sync_concurrency: int = 8,
+        repo_timeout: float = 120.0,
+        summary_concurrency: int = 2,
+        summary_timeout: float = 60.0,
+        summary_cache: SummaryCache | None = None,
+        summary_batch: int = 1,
+        summary_batch_tokens: int = 3000
+    ):
         """
         Initialize CommitAgent.
 
         Args:
             github_client: GitHubClient instance for fetching commits
             as_of: Virtual "current time" for time-travel debugging
+            summarize: Generate AI summaries (off for offline runs and benchmarks)
+            store: Where the cache is persisted (default: cache.json)
+            max_repos: Repos kept in memory; least recently used ones are evicted by trim_cache()
+            max_commits: Commits kept in memory, across repos
+            sync_concurrency: Repos fetched at the same time by sync_repos
+            repo_timeout: Seconds one repo's fetch may take before it is given up for this sync
+            summary_concurrency: AI summaries generated at the same time, in worker threads
+            summary_timeout: Seconds one AI summary may take
+            summary_cache: Generated summaries by input commits (default: summaries.json)
+            summary_batch: Repos summarized per LLM request (1: one request per repo)
+            summary_batch_tokens: Estimated prompt tokens one batched request may carry
         """
         self.github = github_client
-        self.cache = {}  # {repo_id: {"commits": [], "last_fetched": str, "summary": str, "summary_at": str}}
-        self.ai = PolyAgent()
+        self.cache = {}  # {repo_id: {"name": str, "commits": [], "last_fetched": str, "summary": str, "summary_at": str}}
+        self.max_repos = max_repos
+        self.max_commits = max_commits
+        self.sync_concurrency = sync_concurrency
+        self.repo_timeout = repo_timeout
+        self.stats = {"hits": 0, "misses": 0, "evicted_repos": 0, "expired_commits": 0}
+        self._reads = itertools.count()
+        self._last_read: dict[str, int] = {}  # {repo_id: tick of the last get_commits/get_summary}
+        self.store = store or JsonCommitStore()
+        self.dirty: set[str] = set()  # Repo ids changed since the last save
+        self.summarize = summarize
+        self.ai = PolyAgent() if summarize else None
+        self.summaries = SummaryQueue(self, summary_concurrency, summary_timeout, summary_batch, summary_batch_tokens)
+        self.summary_cache = summary_cache or SummaryCache()
+        self.event_cursors: dict[str, int] = {}  # {events feed: newest event id applied}
+        self._undated: dict[str, tuple[str, set[str]]] = {}  # {repo_id: ("owner/repo", shas dated by push time)}
         self.as_of = as_of or datetime.now()
 
     async def sync_repos(self, repos: list[dict]) -> None:
@@ -37,66 +96,406 @@ class CommitAgent:
         Args:
             repos: List of repo dicts with id, name, owner, updated_at
         """
-        for repo in repos:
+        stale = [repo for repo in repos if self._needs_fetch(repo)]
+        if not stale:
+            return
+
+        # Only fetch last 30 days (our longest window) from most recent branch.
+        # Truncate to the hour so repeated requests share an ETag cache key
+        window_start = (self.as_of - timedelta(days=WINDOW_DAYS)).replace(minute=0, second=0, microsecond=0)
+
+        # Cached repos only fetch what is newer than their newest commit
+        since_by_repo = {str(repo["id"]): self._fetch_since(str(repo["id"]), window_start) for repo in stale}
+
+        # Batch-capable backends (GraphQL) fetch every stale repo up front
+        full = [repo for repo in stale if since_by_repo[str(repo["id"])] == window_start]
+        incremental = [repo for repo in stale if since_by_repo[str(repo["id"])] != window_start]
+        try:
+            if full:
+                await self.github.prefetch_commits(full, window_start)
+            if incremental:
+                await self.github.prefetch_commits(incremental, min(since_by_repo[str(r["id"])] for r in incremental))
+        except Exception as e:
+            # Repos without prefetched results are fetched one by one below
+            print(f"  Batched prefetch failed, fetching per repo: {e}")
+
+        # Fetch concurrently; each task only returns its result, so one
+        # failure or timeout never cancels the others
+        results: dict[str, list[CommitRecord] | Exception] = {}
+        semaphore = asyncio.Semaphore(self.sync_concurrency)
+
+        async def fetch(repo: dict) -> None:
             repo_id = str(repo["id"])  # Convert to string for JSON cache lookup
-            updated_at = repo["updated_at"]
-
-            # Check if we need to fetch
-            # Parse timestamps as timezone-aware datetime objects for proper comparison
-            needs_fetch = True
-            if repo_id in self.cache:
-                last_fetched_str = self.cache[repo_id].get("last_fetched")
-                if last_fetched_str:
-                    # Parse both timestamps to timezone-aware datetime objects
-                    updated_at_dt = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-                    last_fetched_dt = datetime.fromisoformat(last_fetched_str)
-                    # Convert naive local time to UTC properly
-                    if last_fetched_dt.tzinfo is None:
-                        # Assume last_fetched is in local time, convert to UTC
-                        last_fetched_dt = last_fetched_dt.astimezone(timezone.utc)
-
-                    if updated_at_dt <= last_fetched_dt:
-                        needs_fetch = False
-
-            if needs_fetch:
+            async with semaphore:
                 try:
-                    print(f"Fetching commits for {repo['name']}...")
-                    # Only fetch last 30 days (our longest window) from most recent branch
-                    since = self.as_of - timedelta(days=30)
-                    commits = await self.github.get_commits(
-                        owner=repo["owner"],
-                        repo=repo["name"],
-                        since=since,
-                        per_page=100,
-                        use_most_recent_branch=True
-                    )
-
-                    # Store in cache
-                    self.cache[repo_id] = {
-                        "commits": commits,
-                        "last_fetched": self.as_of.isoformat(),
-                        "summary": None,
-                        "summary_at": None,
-                    }
-
-                    # Generate AI summary for recent commits
-                    if commits:
-                        summary = await self._generate_summary(repo["name"], commits[:5])
-                        self.cache[repo_id]["summary"] = summary
-                        self.cache[repo_id]["summary_at"] = self.as_of.isoformat()
+                    async with asyncio.timeout(self.repo_timeout):
+                        results[repo_id] = await self._fetch_commits(repo, since_by_repo[repo_id])
                 except Exception as e:
-                    print(f"  Error fetching {repo['name']}: {str(e)}")
-                    # Store empty cache entry so we don't retry immediately
+                    results[repo_id] = e
+
+        async with asyncio.TaskGroup() as tasks:
+            for repo in stale:
+                tasks.create_task(fetch(repo))
+
+        # Apply in input order, so the cache does not depend on completion order
+        for repo in stale:
+            repo_id = str(repo["id"])
+            since = since_by_repo[repo_id]
+            commits = results[repo_id]
+            if isinstance(commits, Exception):
+                error = str(commits) or type(commits).__name__
+                print(f"  Error fetching {repo['name']}: {error}")
+                # Keep serving what we had; without a last_fetched stamp the
+                # repo is retried next sync instead of waiting for a new push
+                if repo_id not in self.cache:
                     self.cache[repo_id] = {
                         "commits": [],
-                        "last_fetched": self.as_of.isoformat(),
-                        "summary": f"Error: {str(e)[:50]}",
+                        "last_fetched": None,
+                        "summary": f"Error: {error[:50]}",
                         "summary_at": self.as_of.isoformat(),
                     }
+                    self.dirty.add(repo_id)
+                continue
+
+            if since == window_start:
+                # Store in cache; a full fetch dates every commit
+                self._undated.pop(repo_id, None)
+                self.cache[repo_id] = {
+                    "name": repo["name"],
+                    "commits": commits,
+                    "last_fetched": self.as_of.isoformat(),
+                    "summary": None,
+                    "summary_at": None,
+                }
+                added = len(commits)
+            else:
+                # Merge into the cached history and drop what aged out
+                added = self._merge_commits(repo_id, commits, redate=True)
+                self._prune_commits(repo_id, window_start)
+                self.cache[repo_id]["name"] = repo["name"]
+                self.cache[repo_id]["last_fetched"] = self.as_of.isoformat()
+                print(f"  {repo['name']}: {added} new commits since {since.isoformat()}")
+            self.dirty.add(repo_id)
+
+            # Queue an AI summary of the recent commits; sync does not wait for it
+            if added:
+                self.request_summary(repo_id)
+
+    async def _fetch_commits(self, repo: dict, since: datetime) -> list[CommitRecord]:
+        """Fetch a repo's commits since `since` from its most recently active branch."""
+        print(f"Fetching commits for {repo['name']}...")
+        commits = []
+        async for commit in self.github.iter_commits(
+            owner=repo["owner"],
+            repo=repo["name"],
+            since=since,
+            per_page=100,
+            use_most_recent_branch=True
+        ):
+            commits.append(CommitRecord.from_dict(commit))  # Dates are parsed here, once
+        return commits
+
+    async def sync_events(self, usernames: list[str], orgs: tuple[str, ...] = ()) -> set[str] | None:
+        """
+        Apply new PushEvents from the users' (and orgs') events feeds to the cache.
+
+        Pushed commits are merged into cached repos and the repo is stamped
+        as fetched, so sync_repos skips it. Push payloads carry no commit
+        dates: new commits are stored with the push time, then re-dated from
+        the commit API before their summaries are requested.
+
+        Args:
+            usernames: GitHub logins whose events to poll (every account of the token pool)
+            orgs: Organizations whose events to poll as well, as seen by each login
+
+        Returns:
+            Ids of repos that changed (empty if nothing moved), or None if a
+            full sync_repos pass is needed: a feed has a gap (first poll, or
+            more new events than one page), or a push went to a repo that is
+            not cached or whose commits must be refetched
+        """
+        touched: set[str] = set()
+        gap = False
+        for username in usernames:
+            for org in (None, *orgs):
+                events = await self.github.poll_events(username, org)
+                if events is None:
+                    continue  # Unchanged (304) or polled too early
+                feed = f"{username}/{org}" if org else username
+                feed_touched, complete = self._apply_push_events(feed, events)
+                touched |= feed_touched
+                gap |= not complete
+
+        touched |= await self._redate_pushed_commits()
+        for repo_id in touched:
+            self.request_summary(repo_id)
+        return None if gap else touched
+
+    def _apply_push_events(self, feed: str, events: list[dict]) -> tuple[set[str], bool]:
+        """
+        Merge PushEvents newer than the feed's cursor.
 
-    async def _generate_summary(self, repo_name: str, recent_commits: list[dict]) -> str:
+        Returns:
+            Ids of repos whose commits changed, and False if sync_repos must
+            still run: a gap in the feed, a push to an untracked (or evicted)
+            repo, or a push whose commits have to be refetched
+        """
+        if not events:
+            return set(), True
+        last_seen = self.event_cursors.get(feed)
+        self.event_cursors[feed] = max(self.event_cursors.get(feed, 0), *(int(e["id"]) for e in events))
+
+        new_events = [e for e in events if last_seen is not None and int(e["id"]) > last_seen]
+        if last_seen is None or len(new_events) == len(events):
+            return set(), False  # Older events may be missing from this page
+
+        touched = set()
+        needs_sync = False
+        for event in reversed(new_events):  # Oldest first
+            if event["type"] != "PushEvent":
+                continue
+            repo_id = str(event["repo"]["id"])
+            if repo_id not in self.cache:
+                needs_sync = True  # Not tracked (or evicted): the repo listing picks it up
+                continue
+
+            payload = event["payload"]
+            if not self._tracks_ref(event["repo"]["name"], payload["ref"]):
+                needs_sync = True  # Another (or an unknown) branch: sync_repos finds the most active one
+                continue
+            commits = payload.get("commits")
+            if commits is None or payload.get("size", len(commits)) > len(commits):
+                # Commit list missing or truncated (GitHub caps it at 20): refetch
+                self.cache[repo_id]["last_fetched"] = None
+                self.dirty.add(repo_id)
+                needs_sync = True
+                continue
+
+            # Dated by the push until _redate_pushed_commits looks them up
+            pushed_at = parse_epoch(event["created_at"])
+            known = {commit.sha for commit in self.cache[repo_id]["commits"]}
+            self._merge_commits(repo_id, [
+                CommitRecord(commit["sha"], commit["message"], pushed_at, commit["author"]["name"])
+                for commit in commits
+            ])
+            undated = {commit["sha"] for commit in commits} - known
+            if undated:
+                self._undated.setdefault(repo_id, (event["repo"]["name"], set()))[1].update(undated)
+            self.cache[repo_id].setdefault("name", event["repo"]["name"].split("/", 1)[-1])
+            self.cache[repo_id]["last_fetched"] = self.as_of.isoformat()
+            self.dirty.add(repo_id)
+            touched.add(repo_id)
+        return touched, not needs_sync
+
+    def apply_push(self, payload: dict) -> str | None:
+        """
+        Merge the commits of a push webhook payload into the cache.
+
+        Webhook payloads carry each commit's timestamp, so unlike the events
+        feed no dates are guessed. Only pushes to the branch the repo's
+        commits were fetched from, or to its default branch, are merged;
+        pushes to other branches and repos that are not cached yet are left
+        for sync_repos, which picks the most recently active branch.
+
+        Args:
+            payload: Body of a GitHub "push" webhook delivery
+
+        Returns:
+            Id of the repo whose commits changed, or None if nothing changed
+        """
+        repository = payload["repository"]
+        repo_id = str(repository["id"])
+        if repo_id not in self.cache or payload.get("deleted"):
+            return None
+        if not self._tracks_ref(repository["full_name"], payload["ref"], repository.get("default_branch")):
+            return None
+
+        added = self._merge_commits(repo_id, [
+            # Webhooks send local offsets; epochs make them comparable with the rest
+            CommitRecord(commit["id"], commit["message"], parse_epoch(commit["timestamp"]), commit["author"]["name"])
+            for commit in payload.get("commits", [])
+        ])
+        self.cache[repo_id].setdefault("name", repository["name"])
+        self.cache[repo_id]["last_fetched"] = self.as_of.isoformat()
+        self.dirty.add(repo_id)
+        return repo_id if added else None
+
+    def _tracks_ref(self, full_name: str, ref: str, default_branch: str | None = None) -> bool:
+        """Check whether a pushed ref is the branch the repo's commits were fetched from (or its default)."""
+        if not ref.startswith("refs/heads/"):
+            return False  # Tags
+        branch = ref.removeprefix("refs/heads/")
+        return branch in (self.github.commit_branches.get(full_name), default_branch)
+
+    def _merge_commits(self, repo_id: str, commits: list[CommitRecord], redate: bool = False) -> int:
         """
-        Generate AI summary of recent commits.
+        Merge commits into a cached repo, deduplicated by sha, newest first.
+
+        Args:
+            repo_id: Cached repo to merge into
+            commits: Commits to merge
+            redate: The commits come from the commit API, so their dates are
+                authoritative: cached copies of the same shas (dated by a
+                push event) are replaced
+
+        Returns:
+            Number of commits that were not cached yet
+        """
+        cached = self.cache[repo_id]["commits"]
+        known = {commit.sha for commit in cached}
+        new = [commit for commit in commits if commit.sha not in known]
+        if redate and len(new) < len(commits):
+            fetched = {commit.sha for commit in commits}
+            merged = list(commits) + [commit for commit in cached if commit.sha not in fetched]
+            self._settle_dates(repo_id, fetched)
+        elif new:
+            merged = new + list(cached)
+        else:
+            return 0
+        merged.sort(key=lambda commit: commit.epoch, reverse=True)
+        self.cache[repo_id]["commits"] = merged
+        return len(new)
+
+    async def _redate_pushed_commits(self) -> set[str]:
+        """
+        Replace the push-time dates of commits merged from events with their own.
+
+        Looks the commits up concurrently, sync_concurrency at a time. A
+        lookup that fails is retried on the next poll, unless the commit is
+        gone (404, e.g. force-pushed away).
+
+        Returns:
+            Ids of repos whose commit dates changed
+        """
+        semaphore = asyncio.Semaphore(self.sync_concurrency)
+        dates: dict[str, dict[str, int]] = {}
+
+        async def lookup(repo_id: str, full_name: str, sha: str) -> None:
+            owner, name = full_name.split("/", 1)
+            async with semaphore:
+                try:
+                    date = await self.github.get_commit_date(owner, name, sha)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 404:
+                        self._settle_dates(repo_id, {sha})
+                    print(f"  Could not date {full_name}@{sha[:7]}: {e}")
+                    return
+                except Exception as e:
+                    print(f"  Could not date {full_name}@{sha[:7]}: {e}")
+                    return
+            dates.setdefault(repo_id, {})[sha] = parse_epoch(date)
+
+        for repo_id in [repo_id for repo_id in self._undated if repo_id not in self.cache]:
+            del self._undated[repo_id]  # Evicted since the push
+        await asyncio.gather(*(
+            lookup(repo_id, full_name, sha)
+            for repo_id, (full_name, shas) in list(self._undated.items())
+            for sha in list(shas)
+        ))
+
+        changed = set()
+        for repo_id, redated in dates.items():
+            self._settle_dates(repo_id, redated.keys())
+            if repo_id not in self.cache:
+                continue
+            commits = [
+                CommitRecord(commit.sha, commit.message, redated[commit.sha], commit.author)
+                if commit.sha in redated else commit
+                for commit in self.cache[repo_id]["commits"]
+            ]
+            commits.sort(key=lambda commit: commit.epoch, reverse=True)
+            self.cache[repo_id]["commits"] = commits
+            self.dirty.add(repo_id)
+            changed.add(repo_id)
+        return changed
+
+    def _settle_dates(self, repo_id: str, shas) -> None:
+        """Stop tracking commits whose dates no longer need a lookup."""
+        pending = self._undated.get(repo_id)
+        if pending is None:
+            return
+        pending[1].difference_update(shas)
+        if not pending[1]:
+            del self._undated[repo_id]
+
+    def _fetch_since(self, repo_id: str, window_start: datetime) -> datetime:
+        """
+        Start of the commit range to fetch for a repo.
+
+        Repos with cached commits resume from their newest commit (GitHub's
+        `since` is inclusive, the overlap is deduplicated by sha); others
+        fetch the whole window.
+        """
+        entry = self.cache.get(repo_id)
+        if not entry or not entry.get("commits") or not entry.get("last_fetched"):
+            return window_start
+
+        newest = datetime.fromtimestamp(entry["commits"][0].epoch, timezone.utc)
+        # Naive UTC, as GitHub reads an offset-less `since`; hour-truncated like window_start
+        newest = newest.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+        return max(newest, window_start)
+
+    def _prune_commits(self, repo_id: str, window_start: datetime) -> int:
+        """
+        Drop cached commits older than the longest scoring window.
+
+        Returns:
+            Number of commits dropped
+        """
+        # Board reads naive as_of as UTC, while GitHub's `since` is an instant:
+        # keep everything either reading could still count
+        cutoff = int(min(window_start.replace(tzinfo=timezone.utc), window_start.astimezone(timezone.utc)).timestamp())
+        commits = self.cache[repo_id]["commits"]
+        kept = [commit for commit in commits if commit.epoch >= cutoff]
+        self.cache[repo_id]["commits"] = kept
+        if len(kept) < len(commits):
+            self.dirty.add(repo_id)
+        return len(commits) - len(kept)
+
+    def request_summary(self, repo_id: str) -> None:
+        """Refresh a cached repo's AI summary: from the summary cache if its latest commits were seen, else queued."""
+        if not self.summarize:
+            return
+        summary = self.summary_cache.get(self.summary_key(repo_id))
+        if summary is None:
+            self.summaries.enqueue(repo_id)
+        elif summary != self.cache[repo_id].get("summary"):
+            self.set_summary(repo_id, summary)
+
+    def summary_key(self, repo_id: str) -> str:
+        """Summary cache key of the commits a repo's summary is generated from."""
+        entry = self.cache[repo_id]
+        return SummaryCache.key(entry.get("name", repo_id), entry["commits"][:5])
+
+    def set_summary(self, repo_id: str, summary: str) -> None:
+        """Store a generated summary for a cached repo."""
+        self.cache[repo_id]["summary"] = summary
+        self.cache[repo_id]["summary_at"] = self.as_of.isoformat()
+        self.dirty.add(repo_id)
+
+    def _needs_fetch(self, repo: dict) -> bool:
+        """Check whether a repo was pushed to since its commits were last fetched."""
+        repo_id = str(repo["id"])  # Convert to string for JSON cache lookup
+        if repo_id not in self.cache:
+            return True
+
+        last_fetched_str = self.cache[repo_id].get("last_fetched")
+        if not last_fetched_str:
+            return True
+
+        # Parse both timestamps to timezone-aware datetime objects for proper comparison
+        updated_at_dt = datetime.fromisoformat(repo["updated_at"].replace('Z', '+00:00'))
+        last_fetched_dt = datetime.fromisoformat(last_fetched_str)
+        # Convert naive local time to UTC properly
+        if last_fetched_dt.tzinfo is None:
+            # Assume last_fetched is in local time, convert to UTC
+            last_fetched_dt = last_fetched_dt.astimezone(timezone.utc)
+
+        return updated_at_dt > last_fetched_dt
+
+    def _generate_summary(self, repo_name: str, recent_commits: list[dict]) -> str:
+        """
+        Generate AI summary of recent commits (blocking; run by SummaryQueue in a worker thread).
 
         Args:
             repo_name: Repository name
@@ -104,6 +503,9 @@ class CommitAgent:
 
         Returns:
             Summary string
+
+        Raises:
+            Exception: Whatever the LLM call raised (failures are not cached)
         """
         if not recent_commits:
             return "No recent activity"
@@ -117,47 +519,166 @@ class CommitAgent:
 
 Provide 3-5 keywords describing the work, no subject term. Example: "fixing UI bugs, refactoring auth, adding tests" """
 
-        try:
-            result = self.ai.run(
-                prompt=prompt,
-                model="claude-haiku-4.5",
-                cli="no-tools",
-                ephemeral=True,  # Don't save to conversation history
-                schema_cls=CommitSummary
-            )
-
-            if result.has_data():
-                return result.data["summary"]
-            return result.content.strip()
-        except Exception as e:
-            return f"Summary generation failed: {str(e)}"
+        result = self.ai.run(
+            prompt=prompt,
+            model="claude-haiku-4.5",
+            cli="no-tools",
+            ephemeral=True,  # Don't save to conversation history
+            schema_cls=CommitSummary
+        )
+
+        if result.has_data():
+            return result.data["summary"]
+        return result.content.strip()
+
+    def _generate_summaries(self, repos: list[tuple[str, str, list]]) -> dict[str, str]:
+        """
+        Generate AI summaries of several repos' recent commits in one request (blocking).
+
+        Args:
+            repos: (repo_id, repo_name, recent commits) per repo
+
+        Returns:
+            {repo_id: summary} for the repos the response covered
+
+        Raises:
+            ValidationError: The response did not match CommitSummaryBatch
+            Exception: Whatever the LLM call raised
+        """
+        sections = []
+        for repo_id, repo_name, recent_commits in repos:
+            commit_text = f"[{repo_id}] Repository: {repo_name}\nRecent commits:\n"
+            for i, commit in enumerate(recent_commits, 1):
+                commit_text += f"{i}. {commit['message']}\n"
+            sections.append(commit_text)
+
+        prompt = "\n".join(sections) + """
+For each repository above, provide 3-5 keywords describing the work, no subject term. Example: "fixing UI bugs, refactoring auth, adding tests". Set `repo` to the repository's id, the number in brackets before its name."""
+
+        result = self.ai.run(
+            prompt=prompt,
+            model="claude-haiku-4.5",
+            cli="no-tools",
+            ephemeral=True,  # Don't save to conversation history
+            schema_cls=CommitSummaryBatch
+        )
+
+        batch = CommitSummaryBatch.model_validate(result.data if result.has_data() else None)
+        requested = {repo_id for repo_id, _, _ in repos}
+        # Models often echo the label as written ("[123]"): match on the bare id
+        summaries = {item.repo.strip("[] "): item.summary for item in batch.summaries}
+        return {repo_id: summary for repo_id, summary in summaries.items() if repo_id in requested}
 
     def get_commits(self, repo_id: int) -> list[dict]:
         """Get cached commits for a repo."""
         repo_id = str(repo_id)  # Convert to string for JSON cache lookup
         if repo_id in self.cache:
+            self.stats["hits"] += 1
+            self._last_read[repo_id] = next(self._reads)
             return self.cache[repo_id].get("commits", [])
+        self.stats["misses"] += 1
         return []
 
     def get_summary(self, repo_id: int) -> str:
         """Get AI summary for a repo."""
         repo_id = str(repo_id)  # Convert to string for JSON cache lookup
         if repo_id in self.cache:
+            self.stats["hits"] += 1
+            self._last_read[repo_id] = next(self._reads)
             return self.cache[repo_id].get("summary") or "No summary available"
+        self.stats["misses"] += 1
         return "Not synced yet"
 
-    def save_cache(self, filepath: str = "cache.json") -> None:
-        """Save cache to JSON file."""
-        with open(filepath, "w") as f:
-            json.dump(self.cache, f, indent=2)
-        print(f"Cache saved to {filepath}")
-
-    def load_cache(self, filepath: str = "cache.json") -> None:
-        """Load cache from JSON file."""
-        path = Path(filepath)
-        if path.exists():
-            with open(filepath, "r") as f:
-                self.cache = json.load(f)
-            print(f"Cache loaded from {filepath}")
-        else:
-            print(f"No cache file found at {filepath}")
+    def release_commits(self, keep: set[str]) -> int:
+        """
+        Drop hydrated commit lists of lazily loaded repos not in `keep`.
+
+        Args:
+            keep: Repo ids whose commits stay in memory (e.g. the ones on the dashboard)
+
+        Returns:
+            Number of repos released
+        """
+        released = 0
+        for repo_id, entry in self.cache.items():
+            commits = entry.get("commits")
+            if repo_id not in keep and getattr(commits, "hydrated", False):
+                commits.release()
+                released += 1
+        return released
+
+    def trim_cache(self, keep: set[str]) -> None:
+        """
+        Apply the retention limits to the in-memory cache.
+
+        Commits that aged out of the scoring window are expired, lazily
+        loaded history of repos not in `keep` is released, and then the
+        least recently read repos not in `keep` are evicted until the
+        cache is within max_repos and max_commits. Repos with unsaved
+        changes are not evicted; an evicted repo is refetched if it shows
+        up on the board again.
+
+        Args:
+            keep: Repo ids on the current board
+        """
+        window_start = (self.as_of - timedelta(days=WINDOW_DAYS)).replace(minute=0, second=0, microsecond=0)
+        for repo_id, entry in self.cache.items():
+            if isinstance(entry.get("commits"), list):  # Lazy and mapped commits are not resident
+                self.stats["expired_commits"] += self._prune_commits(repo_id, window_start)
+        self.release_commits(keep)
+
+        resident = sum(self._resident_commits(entry) for entry in self.cache.values())
+        for repo_id in sorted(self.cache, key=lambda repo_id: self._last_read.get(repo_id, -1)):  # LRU first
+            over_repos = self.max_repos is not None and len(self.cache) > self.max_repos
+            over_commits = self.max_commits is not None and resident > self.max_commits
+            if not (over_repos or over_commits):
+                break
+            if repo_id in keep or repo_id in self.dirty:
+                continue
+            resident -= self._resident_commits(self.cache.pop(repo_id))
+            self._last_read.pop(repo_id, None)
+            self.stats["evicted_repos"] += 1
+
+    def _resident_commits(self, entry: dict) -> int:
+        """Commits of a cache entry that are held in memory."""
+        commits = entry.get("commits", [])
+        return len(commits) if isinstance(commits, list) or getattr(commits, "hydrated", False) else 0
+
+    def cache_status(self) -> dict:
+        """Retention stats plus the current size of the in-memory cache."""
+        return {
+            **self.stats,
+            "repos": len(self.cache),
+            "resident_commits": sum(self._resident_commits(entry) for entry in self.cache.values()),
+            "max_repos": self.max_repos,
+            "max_commits": self.max_commits,
+        }
+
+    def save_cache(self, filepath: str | None = None) -> None:
+        """
+        Persist the repos that changed since the last save.
+
+        Args:
+            filepath: Write the whole cache to this JSON file instead of the store
+        """
+        if filepath:
+            JsonCommitStore(filepath).save(self.cache)
+            return
+        self.store.save(self.cache, self.dirty)
+        self.dirty = set()
+        self.summary_cache.save()
+
+    def load_cache(self, filepath: str | None = None) -> None:
+        """
+        Load the cache from the store.
+
+        Args:
+            filepath: Read this JSON file instead of the store
+        """
+        store = JsonCommitStore(filepath) if filepath else self.store
+        self.cache = store.load()
+        self.summary_cache.load()
+        for entry in self.cache.values():
+            if isinstance(entry.get("commits"), list):  # JSON and journal stores return dicts
+                entry["commits"] = [as_record(commit) for commit in entry["commits"]]
+        self.dirty = set() if store is self.store else set(self.cache)
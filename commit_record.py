@@ -0,0 +1,67 @@
+"""
+CommitRecord - Compact in-memory commit with a pre-parsed timestamp.
+"""
+import sys
+from datetime import datetime, timezone
+
+
+class CommitRecord:
+    """
+    One cached commit.
+
+    Dates are parsed once at ingest into UTC epoch seconds, so window
+    counts are integer comparisons. Author names are interned (a handful
+    of authors repeat across thousands of commits). Item access
+    (commit["sha"], commit["date"], ...) is kept for code and stores that
+    treat commits as dicts; "date" is rendered back to an ISO string.
+    """
+
+    __slots__ = ("sha", "message", "epoch", "author")
+
+    def __init__(self, sha: str, message: str, epoch: int, author: str | None):
+        self.sha = sha
+        self.message = message
+        self.epoch = epoch
+        self.author = sys.intern(author) if author else author
+
+    @classmethod
+    def from_dict(cls, commit: dict) -> "CommitRecord":
+        """Build a record from a commit dict with sha, message, date and author."""
+        return cls(commit["sha"], commit["message"], parse_epoch(commit["date"]), commit["author"])
+
+    @property
+    def date(self) -> str:
+        return format_epoch(self.epoch)
+
+    def __getitem__(self, key: str):
+        if key not in ("sha", "message", "date", "author"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, dict):
+            other = CommitRecord.from_dict(other)
+        if not isinstance(other, CommitRecord):
+            return NotImplemented
+        return (self.sha, self.message, self.epoch, self.author) == (other.sha, other.message, other.epoch, other.author)
+
+    def __repr__(self) -> str:
+        return f"CommitRecord({self.sha[:7]}, {self.date}, {self.author!r})"
+
+    def to_dict(self) -> dict:
+        return {"sha": self.sha, "message": self.message, "date": self.date, "author": self.author}
+
+
+def as_record(commit) -> CommitRecord:
+    """Return a commit as a CommitRecord, converting dicts (e.g. read from JSON)."""
+    return commit if isinstance(commit, CommitRecord) else CommitRecord.from_dict(commit)
+
+
+def parse_epoch(date: str) -> int:
+    """Epoch seconds of an ISO 8601 date ("Z" or offset suffix)."""
+    return int(datetime.fromisoformat(date.replace("Z", "+00:00")).timestamp())
+
+
+def format_epoch(epoch: int) -> str:
+    """ISO 8601 UTC date with a "Z" suffix, as GitHub writes them."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -0,0 +1,665 @@
+"""
+Commit stores - Where CommitAgent persists its cache.
+
+    uv run python commit_store.py migrate cache.json cache.db
+    uv run python commit_store.py migrate cache.json cache.gdc
+    uv run python commit_store.py counts cache.db
+"""
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import zlib
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from commit_record import CommitRecord, as_record, format_epoch, parse_epoch
+
+
+class CommitStore:
+    """Persists the CommitAgent cache: {repo_id: {name, commits, last_fetched, summary, summary_at}}."""
+
+    def load(self) -> dict:
+        """Read every cached repo."""
+        raise NotImplementedError
+
+    def save(self, cache: dict, changed: set[str] | None = None) -> None:
+        """
+        Persist the cache.
+
+        Args:
+            cache: The full cache dict
+            changed: Repo ids modified since the last save (None: all of them)
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonCommitStore(CommitStore):
+    """The whole cache as one JSON file, rewritten on every save."""
+
+    def __init__(self, path: str = "cache.json"):
+        self.path = path
+
+    def load(self) -> dict:
+        path = Path(self.path)
+        if not path.exists():
+            print(f"No cache file found at {self.path}")
+            return {}
+        with open(path, "r") as f:
+            cache = json.load(f)
+        print(f"Cache loaded from {self.path}")
+        return cache
+
+    def save(self, cache: dict, changed: set[str] | None = None) -> None:
+        # Write a temp file and rename it over the cache, so a crash never leaves half a file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2, default=_json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        print(f"Cache saved to {self.path}")
+
+
+def _json_default(value):
+    """Serialize commit records and lazy commit sequences as plain JSON."""
+    if isinstance(value, CommitRecord):
+        return value.to_dict()
+    if isinstance(value, Sequence):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class LazyCommits(Sequence):
+    """
+    One repo's commits (newest first), read from the store on first access.
+
+    Until then only the count is held; window counts are answered by the
+    store. release() drops the hydrated list so a dormant repo's history
+    can be reclaimed and read again when needed.
+    """
+
+    def __init__(self, load, count: int, count_since):
+        """
+        Args:
+            load: Callable returning the repo's commit list
+            count: Number of commits stored
+            count_since: Callable(epoch) counting stored commits at or after epoch
+        """
+        self._load = load
+        self._count = count
+        self._count_since = count_since
+        self._commits: list[dict] | None = None
+
+    @property
+    def hydrated(self) -> bool:
+        return self._commits is not None
+
+    def _hydrate(self) -> list[dict]:
+        if self._commits is None:
+            self._commits = self._load()
+        return self._commits
+
+    def release(self) -> None:
+        """Forget the hydrated commits; the next access reads them again."""
+        self._commits = None
+
+    def __len__(self) -> int:
+        return self._count if self._commits is None else len(self._commits)
+
+    def __getitem__(self, index):
+        return self._hydrate()[index]
+
+    def __iter__(self):
+        return iter(self._hydrate())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def count_since(self, epoch: int) -> int:
+        """Number of commits at or after `epoch`, without hydrating if possible."""
+        if self._commits is None:
+            return self._count_since(epoch)
+        return sum(1 for commit in self._commits if commit.epoch >= epoch)
+
+
+class SqliteCommitStore(CommitStore):
+    """
+    SQLite store that only writes the repos that changed.
+
+    Commits live in their own table indexed by (repo_id, date), so saves
+    are batched upserts of new rows and window counts are index range
+    scans. WAL mode keeps readers unblocked while a save is committing.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS repos (
+            repo_id TEXT PRIMARY KEY,
+            name TEXT,
+            last_fetched TEXT,
+            commit_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS summaries (
+            repo_id TEXT PRIMARY KEY,
+            summary TEXT,
+            summary_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS commits (
+            repo_id TEXT NOT NULL,
+            sha TEXT NOT NULL,
+            date TEXT NOT NULL,
+            message TEXT,
+            author TEXT,
+            PRIMARY KEY (repo_id, sha)
+        );
+        CREATE INDEX IF NOT EXISTS commits_by_date ON commits (repo_id, date);
+    """
+
+    def __init__(self, path: str = "cache.db"):
+        """
+        Open (or create) the database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        # Writer: saves run in a worker thread, one at a time (CachePersister holds a lock)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, safe in WAL mode
+        self.conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(repos)")}
+        if "commit_count" not in columns:
+            # Databases from before the column: count once, then saves keep it current
+            with self.conn:
+                self.conn.execute("ALTER TABLE repos ADD COLUMN commit_count INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute(
+                    "UPDATE repos SET commit_count = (SELECT COUNT(*) FROM commits WHERE commits.repo_id = repos.repo_id)"
+                )
+        # Reader: lazy hydration and window counts on the event loop. A connection
+        # of its own sees the last committed snapshot (WAL), never a save in progress
+        self.reader = sqlite3.connect(path, check_same_thread=False)
+
+    def load(self) -> dict:
+        """
+        Read repo state and summaries; commits stay on disk until accessed.
+
+        Startup reads one row per repo, commit count included (saves keep
+        it in the repos table), so it never touches the commits table and
+        does not grow with dormant history.
+        """
+        cache = {}
+        rows = self.reader.execute("SELECT repo_id, name, last_fetched, commit_count FROM repos")
+        for repo_id, name, last_fetched, commit_count in rows:
+            cache[repo_id] = {
+                "name": name,
+                "commits": LazyCommits(
+                    lambda repo_id=repo_id: self.load_commits(repo_id),
+                    commit_count,
+                    lambda epoch, repo_id=repo_id: self._count_since(repo_id, epoch),
+                ),
+                "last_fetched": last_fetched,
+                "summary": None,
+                "summary_at": None,
+            }
+        for repo_id, summary, summary_at in self.reader.execute("SELECT repo_id, summary, summary_at FROM summaries"):
+            if repo_id in cache:
+                cache[repo_id]["summary"] = summary
+                cache[repo_id]["summary_at"] = summary_at
+        print(f"Cache loaded from {self.path} ({len(cache)} repos, commits on demand)")
+        return cache
+
+    def load_commits(self, repo_id: str) -> list[CommitRecord]:
+        """Read one repo's commits, newest first."""
+        rows = self.reader.execute(
+            "SELECT sha, message, date, author FROM commits WHERE repo_id = ? ORDER BY date DESC", (repo_id,)
+        )
+        return [CommitRecord(sha, message, parse_epoch(date), author) for sha, message, date, author in rows]
+
+    def save(self, cache: dict, changed: set[str] | None = None) -> None:
+        changed = set(cache) if changed is None else changed
+        if not changed:
+            return
+
+        written = 0
+        with self.conn:  # One transaction for the whole batch
+            for repo_id in changed:
+                entry = cache.get(repo_id)
+                if entry is None:
+                    for table in ("repos", "summaries", "commits"):
+                        self.conn.execute(f"DELETE FROM {table} WHERE repo_id = ?", (repo_id,))
+                    continue
+
+                self.conn.execute(
+                    "INSERT INTO repos (repo_id, name, last_fetched) VALUES (?, ?, ?) "
+                    "ON CONFLICT (repo_id) DO UPDATE SET name = excluded.name, last_fetched = excluded.last_fetched",
+                    (repo_id, entry.get("name"), entry.get("last_fetched")),
+                )
+                self.conn.execute(
+                    "INSERT INTO summaries (repo_id, summary, summary_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (repo_id) DO UPDATE SET summary = excluded.summary, summary_at = excluded.summary_at",
+                    (repo_id, entry.get("summary"), entry.get("summary_at")),
+                )
+
+                commits = entry.get("commits", [])
+                if isinstance(commits, LazyCommits) and not commits.hydrated:
+                    continue  # Commits never left the database, so they are unchanged
+
+                # Diff against what is stored: only new, re-dated or pruned commits are written
+                stored = dict(self.conn.execute("SELECT sha, date FROM commits WHERE repo_id = ?", (repo_id,)))
+                current = {commit["sha"]: commit for commit in commits}
+                upserts = [
+                    (repo_id, sha, commit["date"], commit["message"], commit["author"])
+                    for sha, commit in current.items() if stored.get(sha) != commit["date"]
+                ]
+                deletes = [(repo_id, sha) for sha in stored.keys() - current.keys()]
+                self.conn.executemany(
+                    "INSERT INTO commits (repo_id, sha, date, message, author) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (repo_id, sha) DO UPDATE SET date = excluded.date",
+                    upserts,
+                )
+                self.conn.executemany("DELETE FROM commits WHERE repo_id = ? AND sha = ?", deletes)
+                self.conn.execute("UPDATE repos SET commit_count = ? WHERE repo_id = ?", (len(current), repo_id))
+                written += len(upserts) + len(deletes)
+        print(f"Cache saved to {self.path} ({len(changed)} repos, {written} commit rows)")
+
+    def count_commits(self, repo_id: str, since: datetime) -> int:
+        """
+        Count a repo's commits at or after `since`, from the (repo_id, date) index.
+
+        Args:
+            repo_id: Repo id
+            since: Window start; naive values are taken as UTC
+
+        Returns:
+            Number of stored commits in the window
+        """
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return self._count_since(str(repo_id), int(since.timestamp()))
+
+    def _count_since(self, repo_id: str, epoch: int) -> int:
+        (count,) = self.reader.execute(
+            "SELECT COUNT(*) FROM commits WHERE repo_id = ? AND date >= ?", (repo_id, format_epoch(epoch))
+        ).fetchone()
+        return count
+
+    def close(self) -> None:
+        self.reader.close()
+        self.conn.close()
+
+
+class JournalCommitStore(CommitStore):
+    """
+    Append-only journal of cache mutations, compacted into a snapshot.
+
+    Each save appends only what changed (fetch stamps, summaries, commits
+    added or dropped) as JSON lines closed by an "end" marker, with a
+    single fsync per save. Loading reads the snapshot and replays the
+    journal; a batch cut short by a crash has no "end" marker and is
+    ignored. Once the journal outgrows `compact_bytes` the state is
+    written to a new snapshot (atomic rename) and the journal restarts.
+    Every record is idempotent, so replaying a journal over a snapshot
+    that already contains it is harmless.
+    """
+
+    def __init__(
+        self,
+        path: str = "cache.journal",
+        snapshot_path: str = "cache.snapshot.json",
+        compact_bytes: int = 8 * 1024 * 1024
+    ):
+        """
+        Initialize journal store.
+
+        Args:
+            path: Journal file (JSON lines)
+            snapshot_path: Compacted state the journal applies on top of
+            compact_bytes: Journal size that triggers compaction
+        """
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.compact_bytes = compact_bytes
+        # Last persisted state: {repo_id: {name, last_fetched, summary, summary_at, commits: {sha: commit}}}
+        self.state: dict[str, dict] = {}
+
+    def load(self) -> dict:
+        self.state = {}
+        if Path(self.snapshot_path).exists():
+            with open(self.snapshot_path, "r") as f:
+                for repo_id, entry in json.load(f).items():
+                    self._apply({"op": "repo", "id": repo_id, **entry})
+                    self._apply({"op": "commits", "id": repo_id, "add": entry["commits"]})
+
+        replayed = 0
+        if Path(self.path).exists():
+            batch = []
+            complete = 0  # Byte offset just past the last "end" marker
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn write at the tail
+                    if record["op"] == "end":
+                        for pending in batch:
+                            self._apply(pending)
+                        replayed += len(batch)
+                        batch = []
+                        complete = f.tell()
+                    else:
+                        batch.append(record)
+            if os.path.getsize(self.path) > complete:
+                # Drop the unfinished batch so later appends stay readable
+                os.truncate(self.path, complete)
+
+        if not self.state and not replayed:
+            print(f"No cache file found at {self.snapshot_path}")
+            return {}
+        print(f"Cache loaded from {self.snapshot_path} + {replayed} journal records")
+        return {repo_id: self._entry(repo_id) for repo_id in self.state}
+
+    def save(self, cache: dict, changed: set[str] | None = None) -> None:
+        changed = set(cache) | set(self.state) if changed is None else changed
+        records = []
+        for repo_id in changed:
+            records += self._diff(repo_id, cache.get(repo_id))
+        if not records:
+            return
+
+        start = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        try:
+            with open(self.path, "a") as f:
+                for record in records + [{"op": "end"}]:
+                    f.write(json.dumps(record, separators=(",", ":"), default=_json_default) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            # Cut off the partial batch so the retry's append is not read as a torn tail
+            if os.path.exists(self.path) and os.path.getsize(self.path) > start:
+                os.truncate(self.path, start)
+            raise
+        # Only durable records count as persisted; a failed save is diffed again on retry
+        for record in records:
+            self._apply(record)
+        print(f"Cache saved to {self.path} ({len(records)} records)")
+
+        if os.path.getsize(self.path) >= self.compact_bytes:
+            self.compact()
+
+    def compact(self) -> None:
+        """Write the current state as the snapshot and start an empty journal."""
+        snapshot = {repo_id: self._entry(repo_id) for repo_id in self.state}
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"), default=_json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Crash here: the old journal is replayed over the new snapshot, which is idempotent
+        open(self.path, "w").close()
+        print(f"Cache compacted into {self.snapshot_path} ({len(snapshot)} repos)")
+
+    def _diff(self, repo_id: str, entry: dict | None) -> list[dict]:
+        """Journal records that take the persisted state of a repo to `entry`."""
+        old = self.state.get(repo_id)
+        if entry is None:
+            return [{"op": "delete", "id": repo_id}] if old else []
+        old = old or {"name": None, "last_fetched": None, "summary": None, "summary_at": None, "commits": {}}
+
+        records = []
+        if (entry.get("name"), entry.get("last_fetched")) != (old["name"], old["last_fetched"]):
+            records.append({"op": "repo", "id": repo_id, "name": entry.get("name"), "last_fetched": entry.get("last_fetched")})
+        if (entry.get("summary"), entry.get("summary_at")) != (old["summary"], old["summary_at"]):
+            records.append({"op": "summary", "id": repo_id, "summary": entry.get("summary"), "summary_at": entry.get("summary_at")})
+
+        current = {commit["sha"]: commit for commit in entry.get("commits", [])}
+        added = [
+            commit for sha, commit in current.items()
+            if sha not in old["commits"] or old["commits"][sha]["date"] != commit["date"]
+        ]
+        dropped = list(old["commits"].keys() - current.keys())
+        if added:
+            records.append({"op": "commits", "id": repo_id, "add": added})
+        if dropped:
+            records.append({"op": "drop", "id": repo_id, "shas": dropped})
+        return records
+
+    def _apply(self, record: dict) -> None:
+        """Apply one journal record to the persisted state."""
+        repo_id = record["id"]
+        if record["op"] == "delete":
+            self.state.pop(repo_id, None)
+            return
+
+        state = self.state.setdefault(repo_id, {
+            "name": None, "last_fetched": None, "summary": None, "summary_at": None, "commits": {},
+        })
+        if record["op"] == "repo":
+            state["name"] = record.get("name")
+            state["last_fetched"] = record.get("last_fetched")
+            if "summary" in record:  # Snapshot entries carry the summary too
+                state["summary"] = record["summary"]
+                state["summary_at"] = record["summary_at"]
+        elif record["op"] == "summary":
+            state["summary"] = record["summary"]
+            state["summary_at"] = record["summary_at"]
+        elif record["op"] == "commits":
+            state["commits"].update((commit["sha"], commit) for commit in record["add"])
+        elif record["op"] == "drop":
+            for sha in record["shas"]:
+                state["commits"].pop(sha, None)
+
+    def _entry(self, repo_id: str) -> dict:
+        """Cache entry (fresh dicts, commits newest first) for a persisted repo."""
+        state = self.state[repo_id]
+        return {
+            "name": state["name"],
+            "commits": sorted(state["commits"].values(), key=lambda commit: commit["date"], reverse=True),
+            "last_fetched": state["last_fetched"],
+            "summary": state["summary"],
+            "summary_at": state["summary_at"],
+        }
+
+
+class ColumnarCommits(Sequence):
+    """
+    One repo's commits (newest first), decoded from the mapped columns on access.
+
+    Supports everything the cache does with a commit list: len, indexing,
+    slicing (to a list of dicts), iteration and count_since().
+    """
+
+    def __init__(self, store: "ColumnarCommitStore", start: int, count: int):
+        self.store = store
+        self.start = start
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.store.commit(self.start + index)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def count_since(self, epoch: int) -> int:
+        """Number of commits at or after `epoch`, scanning the timestamp column."""
+        timestamps = self.store.timestamps[self.start:self.start + self.count]
+        return sum(1 for ts in timestamps if ts >= epoch)
+
+
+class ColumnarCommitStore(CommitStore):
+    """
+    Compact binary cache, memory-mapped at load.
+
+    Commits of all repos are stored column by column: int64 epoch
+    timestamps, uint32 indexes into an interned author table, 20-byte
+    binary shas, and int64 offsets into one zlib-compressed message blob.
+    Repo state, summaries and the author table form a small compressed
+    JSON header. Loading maps the file and decodes only that header;
+    commits are decoded on access and messages decompressed on first use.
+    Saves rewrite the file (temp file + atomic rename).
+    """
+
+    MAGIC = b"GDC1"
+    # magic, commits, then offset/length of: meta, timestamps, authors, shas, message offsets, messages
+    HEADER = struct.Struct("<4sQ12Q")
+
+    def __init__(self, path: str = "cache.gdc"):
+        """
+        Initialize columnar store.
+
+        Args:
+            path: Cache file
+        """
+        self.path = path
+        self._mmap: mmap.mmap | None = None
+        self.timestamps: memoryview | None = None
+        self.authors: list[str] = []
+        self._messages: bytes | None = None
+
+    def load(self) -> dict:
+        if not Path(self.path).exists():
+            print(f"No cache file found at {self.path}")
+            return {}
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, count, *sections = self.HEADER.unpack_from(view)
+        if magic != self.MAGIC:
+            raise ValueError(f"{self.path} is not a columnar cache")
+        meta_at, meta_len, ts_at, _, author_at, _, sha_at, _, offsets_at, _ = sections[:10]
+        self._sections = sections
+        self.timestamps = view[ts_at:ts_at + 8 * count].cast("q")
+        self._author_ids = view[author_at:author_at + 4 * count].cast("I")
+        self._shas = view[sha_at:sha_at + 20 * count]
+        self._offsets = view[offsets_at:offsets_at + 8 * (count + 1)].cast("q")
+        self._messages = None
+
+        meta = json.loads(zlib.decompress(view[meta_at:meta_at + meta_len]))
+        self.authors = meta["authors"]
+        cache = {}
+        for repo in meta["repos"]:
+            cache[repo["id"]] = {
+                "name": repo["name"],
+                "commits": ColumnarCommits(self, repo["start"], repo["count"]),
+                "last_fetched": repo["last_fetched"],
+                "summary": repo["summary"],
+                "summary_at": repo["summary_at"],
+            }
+        print(f"Cache loaded from {self.path} ({len(cache)} repos, {count} commits mapped)")
+        return cache
+
+    def commit(self, index: int) -> CommitRecord:
+        """Decode the commit at a global row index."""
+        if self._messages is None:
+            blob_at, blob_len = self._sections[10], self._sections[11]
+            self._messages = zlib.decompress(self._mmap[blob_at:blob_at + blob_len])
+        return CommitRecord(
+            self._shas[20 * index:20 * index + 20].hex(),
+            self._messages[self._offsets[index]:self._offsets[index + 1]].decode(),
+            self.timestamps[index],
+            self.authors[self._author_ids[index]],
+        )
+
+    def save(self, cache: dict, changed: set[str] | None = None) -> None:
+        repos, authors, author_index = [], [], {}
+        timestamps, author_ids, shas, offsets, messages = [], [], [], [0], []
+        for repo_id, entry in cache.items():
+            commits = entry.get("commits", [])
+            repos.append({
+                "id": repo_id,
+                "name": entry.get("name"),
+                "last_fetched": entry.get("last_fetched"),
+                "summary": entry.get("summary"),
+                "summary_at": entry.get("summary_at"),
+                "start": len(timestamps),
+                "count": len(commits),
+            })
+            for commit in map(as_record, commits):
+                timestamps.append(commit.epoch)
+                author_ids.append(author_index.setdefault(commit.author, len(author_index)))
+                shas.append(bytes.fromhex(commit.sha))
+                message = commit.message.encode()
+                messages.append(message)
+                offsets.append(offsets[-1] + len(message))
+        authors = list(author_index)
+
+        sections = [
+            zlib.compress(json.dumps({"repos": repos, "authors": authors}, separators=(",", ":")).encode()),
+            struct.pack(f"<{len(timestamps)}q", *timestamps),
+            struct.pack(f"<{len(author_ids)}I", *author_ids),
+            b"".join(shas),
+            struct.pack(f"<{len(offsets)}q", *offsets),
+            zlib.compress(b"".join(messages)),
+        ]
+        layout, position = [], _align(self.HEADER.size)
+        for section in sections:
+            layout += [position, len(section)]
+            position = _align(position + len(section))
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, len(timestamps), *layout))
+            for (at, _), section in zip(zip(layout[::2], layout[1::2]), sections):
+                f.seek(at)
+                f.write(section)
+            f.flush()
+            os.fsync(f.fileno())
+        # Mapped views of the old file stay valid: the rename only unlinks its name
+        os.replace(tmp_path, self.path)
+        print(f"Cache saved to {self.path} ({len(repos)} repos, {len(timestamps)} commits)")
+
+
+def open_store(path: str) -> CommitStore:
+    """Commit store for a cache file, chosen by extension (.json, .db, .journal, .gdc)."""
+    if path.endswith(".db"):
+        return SqliteCommitStore(path)
+    if path.endswith(".journal"):
+        return JournalCommitStore(path, f"{path[:-len('.journal')]}.snapshot.json")
+    if path.endswith(".gdc"):
+        return ColumnarCommitStore(path)
+    return JsonCommitStore(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage GitDash commit stores")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="Copy a cache between formats (by extension: .json, .db, .journal, .gdc)")
+    migrate.add_argument("source")
+    migrate.add_argument("target")
+    counts = commands.add_parser("counts", help="Print 3d/30d commit counts from a SQLite store")
+    counts.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        source, target = open_store(args.source), open_store(args.target)
+        target.save(source.load())
+        source.close()
+        target.close()
+    else:
+        store = SqliteCommitStore(args.path)
+        now = datetime.now(timezone.utc)
+        for repo_id, name in store.reader.execute("SELECT repo_id, name FROM repos ORDER BY name"):
+            count_3d = store.count_commits(repo_id, now - timedelta(days=3))
+            count_30d = store.count_commits(repo_id, now - timedelta(days=30))
+            print(f"{name or repo_id:<30} {count_3d:>4} {count_30d:>5}")
+        store.close()
@@ -0,0 +1,283 @@
+"""
+Local stand-in for the GitHub REST endpoints GitHubClient uses.
+
+Serves a synthetic account for benchmarks and offline tests, with
+injectable latency, errors, pagination, ETags and rate-limit headers.
+
+    uv run python fake_github.py --repos 200 --commits 300 --latency 0.05
+    GITHUB_API_URL=http://127.0.0.1:8001 GITHUB_TOKEN=fake uv run python server.py
+"""
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, Request, Response
+
+
+@dataclass
+class FakeGitHubConfig:
+    """Shape of the synthetic account and the faults to inject."""
+    repos: int = 30  # Repositories owned by the account
+    commits: int = 150  # Commits per repo, spread over `days`
+    branches: int = 5  # Branches per repo
+    days: int = 45  # History span, in days before server start
+    owner: str = "fake-user"
+    latency: float = 0.0  # Seconds added to every response
+    jitter: float = 0.0  # Extra random latency, up to this many seconds
+    error_rate: float = 0.0  # Fraction of requests answered with a 502
+    max_per_page: int = 100  # Page size cap (GitHub's is 100)
+    etags: bool = True  # Send ETags and answer If-None-Match with 304
+    rate_limit: int = 5000  # Requests per window; 403 once exhausted
+    rate_window: int = 3600  # Seconds until the quota resets
+    poll_interval: int = 60  # X-Poll-Interval sent with the events feed
+    seed: int = 0
+
+
+class FakeGitHub:
+    """Deterministic synthetic account data plus request accounting."""
+
+    def __init__(self, config: FakeGitHubConfig | None = None):
+        """
+        Build the synthetic account.
+
+        Args:
+            config: Account shape and fault injection settings
+        """
+        self.config = config or FakeGitHubConfig()
+        self.random = random.Random(self.config.seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.reset_at = int(time.time()) + self.config.rate_window
+        self.remaining = self.config.rate_limit
+        self.requests = 0  # Every request received
+        self.not_modified = 0  # Requests answered with 304
+        self.events: list[dict] = []  # PushEvents, newest first
+
+        self.repos = []
+        self.commits: dict[str, list[dict]] = {}  # {repo name: commits, newest first}
+        self.branches: dict[str, dict[str, int]] = {}  # {repo name: {branch: index of head commit}}
+        for i in range(self.config.repos):
+            name = f"repo-{i:04d}"
+            commits = self._make_commits(name)
+            self.commits[name] = commits
+            self.branches[name] = {"main": 0} | {
+                f"feature-{b}": self.random.randrange(len(commits)) if commits else 0
+                for b in range(1, self.config.branches)
+            }
+            self.repos.append({
+                "id": 100000 + i,
+                "name": name,
+                "full_name": f"{self.config.owner}/{name}",
+                "owner": {"login": self.config.owner},
+                "language": self.random.choice(["Python", "TypeScript", "Rust", "Go", None]),
+                "pushed_at": commits[0]["commit"]["author"]["date"] if commits else self._iso(self.now),
+            })
+        self.repos.sort(key=lambda repo: repo["pushed_at"], reverse=True)
+
+    def _make_commits(self, repo: str) -> list[dict]:
+        span = self.config.days * 86400
+        offsets = sorted(self.random.randrange(span) for _ in range(self.config.commits))
+        commits = []
+        for n, offset in enumerate(offsets):
+            sha = hashlib.sha1(f"{repo}:{n}".encode()).hexdigest()
+            date = self._iso(self.now - timedelta(seconds=offset))
+            author = {"name": f"dev-{self.random.randrange(4)}", "date": date}
+            commits.append({
+                "sha": sha,
+                "commit": {"message": f"{self.random.choice(['fix', 'add', 'refactor'])} {repo} #{n}", "author": author},
+            })
+        return commits
+
+    def _iso(self, dt: datetime) -> str:
+        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def push(self, repo: str, message: str = "new work", authored: datetime | None = None) -> dict:
+        """Add a commit to a repo's main branch, as if pushed just now (authored then by default)."""
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        commits = self.commits[repo]
+        sha = hashlib.sha1(f"{repo}:{len(commits)}:{time.time()}".encode()).hexdigest()
+        date = self._iso(self.now)
+        author_date = self._iso(authored) if authored else date
+        commit = {"sha": sha, "commit": {"message": message, "author": {"name": "dev-0", "date": author_date}}}
+        commits.insert(0, commit)
+        self.branches[repo] = {branch: (0 if branch == "main" else head + 1) for branch, head in self.branches[repo].items()}
+        for repo_obj in self.repos:
+            if repo_obj["name"] == repo:
+                repo_obj["pushed_at"] = date
+                self.events.insert(0, {
+                    "id": str(1000 + len(self.events)),
+                    "type": "PushEvent",
+                    "created_at": date,
+                    "repo": {"id": repo_obj["id"], "name": repo_obj["full_name"]},
+                    "payload": {
+                        "ref": "refs/heads/main",
+                        "size": 1,
+                        "commits": [{"sha": sha, "message": message, "author": {"name": "dev-0"}}],
+                    },
+                })
+        self.repos.sort(key=lambda repo_obj: repo_obj["pushed_at"], reverse=True)
+        return commit
+
+    async def respond(
+        self,
+        request: Request,
+        body,
+        page_size: int | None = None,
+        extra_headers: dict | None = None,
+    ) -> Response:
+        """Apply latency, faults, quota, pagination and ETags to a response body."""
+        self.requests += 1
+        if self.config.latency or self.config.jitter:
+            await asyncio.sleep(self.config.latency + self.random.uniform(0, self.config.jitter))
+        if self.random.random() < self.config.error_rate:
+            return Response(status_code=502, content=b'{"message": "Server Error"}')
+
+        if time.time() >= self.reset_at:
+            self.reset_at = int(time.time()) + self.config.rate_window
+            self.remaining = self.config.rate_limit
+
+        headers = dict(extra_headers or {})
+        if page_size is not None:
+            page = int(request.query_params.get("page", 1))
+            per_page = min(page_size, self.config.max_per_page)
+            items, body = body, body[(page - 1) * per_page:page * per_page]
+            if page * per_page < len(items):
+                next_url = request.url.include_query_params(page=page + 1)
+                headers["Link"] = f'<{next_url}>; rel="next"'
+
+        content = json.dumps(body).encode()
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        if self.config.etags:
+            headers["ETag"] = etag
+        headers["X-RateLimit-Limit"] = str(self.config.rate_limit)
+        headers["X-RateLimit-Reset"] = str(self.reset_at)
+        headers["X-RateLimit-Resource"] = "core"
+
+        # Conditional hits are free, like on GitHub
+        if self.config.etags and request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            headers["X-RateLimit-Remaining"] = str(self.remaining)
+            return Response(status_code=304, headers=headers)
+
+        if self.remaining <= 0:
+            headers["X-RateLimit-Remaining"] = "0"
+            return Response(status_code=403, headers=headers, content=b'{"message": "API rate limit exceeded"}')
+        self.remaining -= 1
+        headers["X-RateLimit-Remaining"] = str(self.remaining)
+        return Response(content=content, headers=headers, media_type="application/json")
+
+
+def create_app(fake: FakeGitHub | None = None) -> FastAPI:
+    """
+    Build the stand-in API app.
+
+    Args:
+        fake: Account to serve (default: FakeGitHub with default config)
+
+    Returns:
+        FastAPI app; the FakeGitHub is available as app.state.fake
+    """
+    fake = fake or FakeGitHub()
+    app = FastAPI(title="Fake GitHub")
+    app.state.fake = fake
+
+    def per_page(request: Request) -> int:
+        return int(request.query_params.get("per_page", 30))
+
+    @app.get("/user")
+    async def user(request: Request):
+        return await fake.respond(request, {"login": fake.config.owner})
+
+    @app.get("/user/repos")
+    async def user_repos(request: Request):
+        return await fake.respond(request, fake.repos, per_page(request))
+
+    @app.get("/users/{username}/repos")
+    async def users_repos(username: str, request: Request):
+        repos = fake.repos if username == fake.config.owner else []
+        return await fake.respond(request, repos, per_page(request))
+
+    @app.get("/users/{username}/events")
+    async def events(username: str, request: Request):
+        feed = fake.events if username == fake.config.owner else []
+        poll = {"X-Poll-Interval": str(fake.config.poll_interval)}
+        return await fake.respond(request, feed, per_page(request), poll)
+
+    @app.get("/repos/{owner}/{repo}/branches")
+    async def branches(owner: str, repo: str, request: Request):
+        if repo not in fake.commits:
+            return Response(status_code=404)
+        commits = fake.commits[repo]
+        body = [
+            {"name": name, "commit": {"sha": commits[head]["sha"]}}
+            for name, head in fake.branches[repo].items() if commits
+        ]
+        return await fake.respond(request, body, per_page(request))
+
+    @app.get("/repos/{owner}/{repo}/commits")
+    async def commits(owner: str, repo: str, request: Request):
+        if repo not in fake.commits:
+            return Response(status_code=404)
+        history = fake.commits[repo]
+
+        ref = request.query_params.get("sha")
+        if ref in fake.branches[repo]:
+            history = history[fake.branches[repo][ref]:]
+        if "since" in request.query_params:
+            since = _parse_time(request.query_params["since"])
+            history = [c for c in history if _parse_time(c["commit"]["author"]["date"]) >= since]
+        if "until" in request.query_params:
+            until = _parse_time(request.query_params["until"])
+            history = [c for c in history if _parse_time(c["commit"]["author"]["date"]) <= until]
+        return await fake.respond(request, history, per_page(request))
+
+    @app.get("/repos/{owner}/{repo}/commits/{sha}")
+    async def commit(owner: str, repo: str, sha: str, request: Request):
+        match = next((c for c in fake.commits.get(repo, []) if c["sha"] == sha), None)
+        if match is None:
+            return Response(status_code=404)
+        return await fake.respond(request, match)
+
+    @app.get("/rate_limit")
+    async def rate_limit(request: Request):
+        core = {"limit": fake.config.rate_limit, "remaining": fake.remaining, "reset": fake.reset_at}
+        return await fake.respond(request, {"resources": {"core": core}})
+
+    return app
+
+
+def _parse_time(value: str) -> datetime:
+    """Parse a since/until parameter; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a fake GitHub API")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--repos", type=int, default=FakeGitHubConfig.repos)
+    parser.add_argument("--commits", type=int, default=FakeGitHubConfig.commits)
+    parser.add_argument("--branches", type=int, default=FakeGitHubConfig.branches)
+    parser.add_argument("--latency", type=float, default=FakeGitHubConfig.latency)
+    parser.add_argument("--jitter", type=float, default=FakeGitHubConfig.jitter)
+    parser.add_argument("--error-rate", type=float, default=FakeGitHubConfig.error_rate)
+    parser.add_argument("--rate-limit", type=int, default=FakeGitHubConfig.rate_limit)
+    parser.add_argument("--no-etags", action="store_true")
+    args = parser.parse_args()
+
+    config = FakeGitHubConfig(
+        repos=args.repos,
+        commits=args.commits,
+        branches=args.branches,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        etags=not args.no_etags,
+    )
+    uvicorn.run(create_app(FakeGitHub(config)), host="127.0.0.1", port=args.port)
@@ -2,23 +2,68 @@
 Simple GitHub API client wrapper for exploring your repositories.
 """
 import os
+import re
+import time
+import asyncio
+from collections import OrderedDict
+from contextlib import aclosing
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, AsyncIterator
 import httpx
+from rate_limit import RateLimitScheduler, request_priority
+from resilience import RETRY_STATUSES, CircuitBreaker, backoff_delay
+
+
+# Matches the owner/name of repo-scoped endpoints, e.g. /repos/o/r/commits
+REPO_PATH = re.compile(r"/repos/([^/?]+)/([^/?]+)")
 
 
 class GitHubClient:
     """Lightweight wrapper around GitHub REST API."""
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self,
+        token: str | None = None,
+        tokens: list[str] | None = None,
+        base_url: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        cache_size: int = 512,
+        branch_concurrency: int = 8,
+        max_rate_limit_retries: int = 3,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+    ):
         """
         Initialize GitHub client.
 
         Args:
             token: GitHub personal access token (or set GITHUB_TOKEN env var)
+            tokens: Pool of tokens, one per account (or set GITHUB_TOKENS,
+                comma-separated). Requests go to the token with the most
+                remaining quota; repo requests stay on a token that can see the repo
+            base_url: API root (or set GITHUB_API_URL), e.g. a fake_github.py server
+            transport: Custom httpx transport, e.g. cassette.ReplayTransport
+                (pool limits and http2 then come from the transport)
+            max_connections: Upper bound on concurrent connections in the pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection stays in the pool
+            http2: Negotiate HTTP/2 so requests multiplex over one connection
+            cache_size: Max responses kept for conditional (ETag) requests
+            branch_concurrency: Max concurrent branch-head commit lookups
+            max_rate_limit_retries: Retries after 403/429 rate-limit responses
+            timeout: Per-request timeout in seconds
+            max_retries: Retries of idempotent requests after timeouts,
+                connection errors and 5xx responses
         """
-        self.token = token or os.getenv("GITHUB_TOKEN")
-        self.base_url = "https://api.github.com"
+        if tokens is None and os.getenv("GITHUB_TOKENS"):
+            tokens = [t.strip() for t in os.getenv("GITHUB_TOKENS").split(",") if t.strip()]
+        self.tokens = tokens or [token or os.getenv("GITHUB_TOKEN")]
+        self.token = self.tokens[0]
+        self.base_url = base_url or os.getenv("GITHUB_API_URL", "https://api.github.com")
         self.headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -26,44 +71,415 @@ class GitHubClient:
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
 
-    async def get(self, endpoint: str, params: dict | None = None) -> dict | list:
-        """Make GET request to GitHub API."""
-        url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params or {})
-            response.raise_for_status()
-            return response.json()
+        # One pooled client for the lifetime of this object, so every request
+        # after the first reuses an open (TLS) connection instead of handshaking
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            limits=self.limits,
+            http2=http2,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            transport=transport,
+        )
+
+        # Validator cache: (endpoint, params) -> {"etag", "last_modified", "body"}
+        # Replayed as If-None-Match / If-Modified-Since; GitHub answers 304 for
+        # unchanged resources and does not count those against the rate limit
+        self.cache_size = cache_size
+        self._validators: OrderedDict[tuple, dict] = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        # In-flight GETs shared by concurrent identical callers, and
+        # per-endpoint counts of requests issued vs. coalesced onto one
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.request_stats: dict[str, dict[str, int]] = {}
+
+        # Branch index: "owner/repo" -> {branch: (head sha, head commit date)}.
+        # Kept across refreshes so only heads that moved are looked up again
+        self.branch_concurrency = branch_concurrency
+        self.branch_index: dict[str, dict[str, tuple[str, str]]] = {}
+        self.commit_branches: dict[str, str] = {}  # {"owner/repo": branch its commits were last fetched from}
+
+        # One scheduler per token and rate-limit resource ("core", "graphql", ...),
+        # fed by the X-RateLimit-Resource header of each response
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.rate_limits: list[dict[str, RateLimitScheduler]] = [{} for _ in self.tokens]
+        self.repo_tokens: dict[str, int] = {}  # {"owner/repo": token index that listed it}
+
+        # Transient failures are retried with jittered backoff; a host that
+        # keeps failing trips its circuit breaker and requests fail fast
+        self.max_retries = max_retries
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+        # Events feed polling state: endpoint -> {"etag", "next_poll" (epoch seconds)}
+        self._event_polls: dict[str, dict] = {}
+        self.login_tokens: dict[str, int] = {}  # {login: index of the pool token it owns}
+
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self._client.aclose()
+
+    async def get(self, endpoint: str, params: dict | None = None, token_index: int | None = None) -> dict | list:
+        """Make GET request to GitHub API, revalidating cached responses."""
+        body, _ = await self.get_page(endpoint, params, token_index)
+        return body
+
+    async def get_page(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        token_index: int | None = None,
+    ) -> tuple[dict | list, str | None]:
+        """
+        Make GET request and return the body with the Link rel="next" URL.
 
-    async def get_repos(self, username: str | None = None, type: str = "owner", limit: int | None = None) -> list[dict]:
+        Args:
+            endpoint: API path, or an absolute URL taken from a Link header
+            params: Query parameters
+            token_index: Send with this token from the pool (default: routed)
+
+        Returns:
+            Tuple of (response body, next page URL or None)
         """
-        Fetch user's repositories.
+        params = params or {}
+        # Identical concurrent GETs share one request (singleflight). The shared
+        # request is scheduled in its starter's lane, so lanes never share one:
+        # an interactive caller must not wait behind the background reserve
+        flight_key = (request_priority.get(), token_index, endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        stats = self.request_stats.setdefault(self._endpoint_label(endpoint), {"issued": 0, "coalesced": 0})
+
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            stats["coalesced"] += 1
+        else:
+            stats["issued"] += 1
+            flight = asyncio.ensure_future(self._fetch_page(endpoint, params, token_index))
+            self._inflight[flight_key] = flight
+            flight.add_done_callback(lambda done: self._land(flight_key, done))
+        # Shield so one caller giving up does not cancel the request for the others
+        return await asyncio.shield(flight)
+
+    def _land(self, flight_key: tuple, flight: asyncio.Future) -> None:
+        """Forget a finished in-flight request."""
+        self._inflight.pop(flight_key, None)
+        if not flight.cancelled():
+            flight.exception()  # Mark retrieved; callers (if any) re-raise it themselves
+
+    def _endpoint_label(self, endpoint: str) -> str:
+        """Endpoint path for request_stats, with commit shas collapsed."""
+        return re.sub(r"/[0-9a-f]{40}\b", "/{sha}", httpx.URL(endpoint).path)
+
+    async def _fetch_page(
+        self,
+        endpoint: str,
+        params: dict,
+        token_index: int | None,
+    ) -> tuple[dict | list, str | None]:
+        """Send one (conditional) GET and parse the body and next link."""
+        token_index = self._route(endpoint, "core") if token_index is None else token_index
+        # Responses differ per account, so the token is part of the cache key
+        key = (token_index, endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        cached = self._validators.get(key)
+
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            elif cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        # params=None (not {}) so httpx keeps the query string of Link URLs
+        response = await self._send(
+            "GET", endpoint, token_index=token_index, params=params or None, headers=headers
+        )
+
+        if response.status_code == 304 and cached:
+            self._validators.move_to_end(key)
+            self.cache_stats["hits"] += 1
+            return cached["body"], cached["next"]
+
+        response.raise_for_status()
+        body = response.json()
+        next_url = response.links.get("next", {}).get("url")
+        self.cache_stats["misses"] += 1
+        self._remember(key, response, body, next_url)
+        return body, next_url
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        resource: str = "core",
+        token_index: int | None = None,
+        idempotent: bool | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the circuit breaker and the rate-limit
+        scheduler of one pool token.
+
+        Rate-limited responses (403/429 with Retry-After, exhausted quota or
+        a secondary limit) are retried after backing off instead of raised.
+        Idempotent requests are also retried after timeouts, connection
+        errors and 5xx responses, with capped exponential jittered backoff.
+
+        Args:
+            method: HTTP method
+            url: API path or absolute URL
+            resource: Rate-limit resource the request is charged to
+            token_index: Token to send with (default: routed by _route)
+            idempotent: Whether retrying is safe (default: GET/HEAD only)
+            **kwargs: Passed through to httpx
+
+        Returns:
+            The final response
+
+        Raises:
+            CircuitOpenError: GitHub has been failing; retry later
+            RateLimitExceeded: The quota would not allow the request within max_backoff
+            httpx.TransportError: Timeout or connection error after retries
+        """
+        index = self._route(url, resource) if token_index is None else token_index
+        headers = kwargs.pop("headers", None) or {}
+        if self.tokens[index]:
+            headers["Authorization"] = f"Bearer {self.tokens[index]}"
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        breaker = self.breaker(url)
+
+        rate_limit_attempt = 0
+        retry_attempt = 0
+        while True:
+            breaker.before_request()
+            try:
+                await self.rate_limit(resource, index).acquire()
+                response = await self._client.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if not idempotent or retry_attempt >= self.max_retries:
+                    raise
+                await self._retry_pause(url, retry_attempt, type(e).__name__)
+                retry_attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (e.g. a repo timeout) or failed without an answer from
+                # GitHub: a half-open probe must not stay outstanding forever
+                breaker.release_probe()
+                raise
+
+            if response.status_code in RETRY_STATUSES:
+                breaker.record_failure()
+                if idempotent and retry_attempt < self.max_retries:
+                    await self._retry_pause(url, retry_attempt, str(response.status_code))
+                    retry_attempt += 1
+                    continue
+                return response
+            breaker.record_success()
+
+            scheduler = self.rate_limit(response.headers.get("X-RateLimit-Resource", resource), index)
+            scheduler.update(response)
+
+            if rate_limit_attempt == self.max_rate_limit_retries:
+                return response
+            delay = scheduler.backoff(response, rate_limit_attempt)
+            if delay is None:
+                return response
+            print(f"Rate limited on {url}, backing off {delay:.0f}s")
+            rate_limit_attempt += 1
+
+    async def _retry_pause(self, url: str, attempt: int, reason: str) -> None:
+        delay = backoff_delay(attempt)
+        print(f"Retrying {url} after {reason} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Get the circuit breaker for the host a URL points at."""
+        host = self._client.base_url.join(url).host
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(host)
+        return self.breakers[host]
+
+    def _route(self, url: str, resource: str) -> int:
+        """
+        Pick the pool token for a request.
+
+        Repo-scoped requests stay on the token that listed the repo (it is
+        known to have access); everything else goes to the token with the
+        most remaining quota. Tokens that have not reported yet count as full.
+        """
+        if len(self.tokens) == 1:
+            return 0
+
+        match = REPO_PATH.search(url)
+        if match and f"{match.group(1)}/{match.group(2)}" in self.repo_tokens:
+            return self.repo_tokens[f"{match.group(1)}/{match.group(2)}"]
+
+        def remaining(index: int) -> float:
+            scheduler = self.rate_limits[index].get(resource)
+            if scheduler is None or scheduler.remaining is None:
+                return float("inf")
+            return scheduler.remaining
+
+        return max(range(len(self.tokens)), key=remaining)
+
+    def rate_limit(self, resource: str = "core", token_index: int = 0) -> RateLimitScheduler:
+        """Get the scheduler for a rate-limit resource of one pool token."""
+        schedulers = self.rate_limits[token_index]
+        if resource not in schedulers:
+            schedulers[resource] = RateLimitScheduler()
+        return schedulers[resource]
+
+    def rate_limit_budget(self) -> dict:
+        """
+        Live rate-limit state, as last reported by GitHub.
+
+        Returns:
+            Dict with "total" (limit/remaining summed across the pool per
+            resource) and "tokens" (per-token scheduler state, by pool index)
+        """
+        per_token = [
+            {resource: scheduler.budget() for resource, scheduler in schedulers.items()}
+            for schedulers in self.rate_limits
+        ]
+        total: dict[str, dict] = {}
+        for budgets in per_token:
+            for resource, budget in budgets.items():
+                summary = total.setdefault(resource, {"limit": 0, "remaining": 0, "reset": None})
+                summary["limit"] += budget["limit"] or 0
+                summary["remaining"] += budget["remaining"] or 0
+                if budget["reset"] and (summary["reset"] is None or budget["reset"] < summary["reset"]):
+                    summary["reset"] = budget["reset"]  # Earliest reset in the pool
+        return {"total": total, "tokens": per_token}
+
+    def _remember(self, key: tuple, response: httpx.Response, body: dict | list, next_url: str | None) -> None:
+        """Store a response's validators, evicting least recently used entries."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        self._validators[key] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "next": next_url,
+        }
+        self._validators.move_to_end(key)
+        while len(self._validators) > self.cache_size:
+            self._validators.popitem(last=False)
+            self.cache_stats["evictions"] += 1
+
+    async def paginate(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        token_index: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield items across all pages, following Link rel="next".
+
+        The next page is requested as soon as the current one arrives, so
+        network time overlaps with the consumer. Breaking out of the loop
+        cancels the pending prefetch.
+
+        Args:
+            endpoint: API path returning a JSON list
+            params: Query parameters for the first page
+            token_index: Token to fetch every page with (default: routed)
+
+        Yields:
+            Raw items from each page, in order
+        """
+        page = asyncio.ensure_future(self.get_page(endpoint, params, token_index))
+        try:
+            while page is not None:
+                items, next_url = await page
+                page = asyncio.ensure_future(self.get_page(next_url, None, token_index)) if next_url else None
+                for item in items:
+                    yield item
+        finally:
+            if page is not None:
+                page.cancel()
+
+    async def iter_repos(
+        self,
+        username: str | None = None,
+        type: str = "owner",
+        per_page: int = 100,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream user's repositories page by page.
 
         Args:
             username: GitHub username (if None, fetches authenticated user's repos)
             type: Repository type filter - "owner", "public", "member", etc.
-            limit: Maximum number of repos to return (for testing)
+            per_page: Results per page (max 100)
 
-        Returns:
-            List of repository objects with id, name, owner, language, updated_at
+        Yields:
+            Repository objects with id, name, owner, language, updated_at
         """
+        params = {"type": type, "sort": "updated", "per_page": per_page}
         if username:
             endpoint = f"/users/{username}/repos"
         else:
             endpoint = "/user/repos"
+            if len(self.tokens) > 1:
+                # One account per token: list each, then merge by recency
+                repos = []
+                for index in range(len(self.tokens)):
+                    async for repo in self.paginate(endpoint, params, index):
+                        self.repo_tokens.setdefault(repo["full_name"], index)
+                        repos.append(self._normalize_repo(repo))
+                repos = list({repo["id"]: repo for repo in repos}.values())
+                repos.sort(key=lambda repo: repo["updated_at"] or "", reverse=True)
+                for repo in repos:
+                    yield repo
+                return
+
+        async with aclosing(self.paginate(endpoint, params)) as repos:
+            async for repo in repos:
+                yield self._normalize_repo(repo)
+
+    def _normalize_repo(self, repo: dict) -> dict:
+        """Normalize a REST repository object to our schema."""
+        return {
+            "id": repo["id"],
+            "name": repo["name"],
+            "owner": repo["owner"]["login"],
+            "language": repo["language"],
+            "updated_at": repo["pushed_at"],  # Use pushed_at to detect commits on all branches
+        }
+
+    async def get_repos(self, username: str | None = None, type: str = "owner", limit: int | None = None) -> list[dict]:
+        """
+        Fetch user's repositories.
 
-        params = {"type": type, "sort": "updated", "per_page": limit or 100}
-        repos = await self.get(endpoint, params)
+        Args:
+            username: GitHub username (if None, fetches authenticated user's repos)
+            type: Repository type filter - "owner", "public", "member", etc.
+            limit: Maximum number of repos to return (for testing)
 
-        # Normalize to our schema
+        Returns:
+            List of repository objects with id, name, owner, language, updated_at
+        """
         result = []
-        for repo in repos[:limit] if limit else repos:
-            result.append({
-                "id": repo["id"],
-                "name": repo["name"],
-                "owner": repo["owner"]["login"],
-                "language": repo["language"],
-                "updated_at": repo["pushed_at"],  # Use pushed_at to detect commits on all branches
-            })
+        per_page = min(limit, 100) if limit else 100
+        async with aclosing(self.iter_repos(username, type, per_page)) as repos:
+            async for repo in repos:
+                result.append(repo)
+                if limit and len(result) >= limit:
+                    break
         return result
 
     async def get_most_recent_branch(self, owner: str, repo: str) -> str | None:
@@ -78,33 +494,55 @@ class GitHubClient:
             Branch name with most recent commit, or None if error
         """
         try:
-            endpoint = f"/repos/{owner}/{repo}/branches"
-            branches = await self.get(endpoint, {"per_page": 100})
-
-            if not branches:
+            heads = await self.resolve_branch_heads(owner, repo)
+            if not heads:
                 return None
 
-            # Find branch with most recent commit
-            most_recent = None
-            most_recent_date = None
-
-            for branch in branches:
-                # Get commit details for each branch head
-                commit_sha = branch["commit"]["sha"]
-                commit_endpoint = f"/repos/{owner}/{repo}/commits/{commit_sha}"
-                commit_detail = await self.get(commit_endpoint)
-                commit_date = commit_detail["commit"]["author"]["date"]
-
-                if most_recent_date is None or commit_date > most_recent_date:
-                    most_recent_date = commit_date
-                    most_recent = branch["name"]
-
-            return most_recent
+            # Find branch with most recent commit (ISO dates compare lexically)
+            return max(heads, key=lambda name: heads[name][1])
         except Exception as e:
             print(f"Warning: Could not determine most recent branch: {e}")
             return None
 
-    async def get_commits(
+    async def resolve_branch_heads(self, owner: str, repo: str) -> dict[str, tuple[str, str]]:
+        """
+        Resolve every branch head to its commit date, reusing the branch index.
+
+        Only heads whose sha is not already known are looked up, concurrently
+        under a semaphore of branch_concurrency requests.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+
+        Returns:
+            Dict of branch name -> (head sha, head commit date)
+        """
+        endpoint = f"/repos/{owner}/{repo}/branches"
+        branches = [branch async for branch in self.paginate(endpoint, {"per_page": 100})]
+
+        # Dates of heads we have already seen; branches often share a head sha
+        known = {sha: date for sha, date in self.branch_index.get(f"{owner}/{repo}", {}).values()}
+        missing = {branch["commit"]["sha"] for branch in branches} - known.keys()
+
+        semaphore = asyncio.Semaphore(self.branch_concurrency)
+
+        async def lookup(sha: str) -> tuple[str, str]:
+            async with semaphore:
+                return sha, await self.get_commit_date(owner, repo, sha)
+
+        known.update(await asyncio.gather(*(lookup(sha) for sha in missing)))
+
+        heads = {branch["name"]: (branch["commit"]["sha"], known[branch["commit"]["sha"]]) for branch in branches}
+        self.branch_index[f"{owner}/{repo}"] = heads
+        return heads
+
+    async def get_commit_date(self, owner: str, repo: str, sha: str) -> str:
+        """Get a commit's author date (ISO 8601)."""
+        commit_detail = await self.get(f"/repos/{owner}/{repo}/commits/{sha}")
+        return commit_detail["commit"]["author"]["date"]
+
+    async def iter_commits(
         self,
         owner: str,
         repo: str,
@@ -113,9 +551,9 @@ class GitHubClient:
         per_page: int = 100,
         branch: str | None = None,
         use_most_recent_branch: bool = False
-    ) -> list[dict]:
+    ) -> AsyncIterator[dict]:
         """
-        Fetch commits for a repository.
+        Stream commits for a repository page by page.
 
         Args:
             owner: Repository owner
@@ -126,14 +564,16 @@ class GitHubClient:
             branch: Specific branch to fetch from
             use_most_recent_branch: If True, auto-detect most recently active branch
 
-        Returns:
-            List of commit objects with sha, message, date, author
+        Yields:
+            Commit objects with sha, message, date, author
         """
         # Determine which branch to use
         if use_most_recent_branch:
             branch = await self.get_most_recent_branch(owner, repo)
             if branch:
                 print(f"  Using most recent branch: {branch}")
+        if branch:
+            self.commit_branches[f"{owner}/{repo}"] = branch
 
         endpoint = f"/repos/{owner}/{repo}/commits"
         params = {"per_page": per_page}
@@ -145,19 +585,111 @@ class GitHubClient:
         if until:
             params["until"] = until.isoformat()
 
-        raw_commits = await self.get(endpoint, params)
+        async with aclosing(self.paginate(endpoint, params)) as raw_commits:
+            async for commit in raw_commits:
+                # Normalize to our schema
+                yield {
+                    "sha": commit["sha"],
+                    "message": commit["commit"]["message"],
+                    "date": commit["commit"]["author"]["date"],
+                    "author": commit["commit"]["author"]["name"],
+                }
+
+    async def get_commits(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        per_page: int = 100,
+        branch: str | None = None,
+        use_most_recent_branch: bool = False,
+        limit: int | None = None
+    ) -> list[dict]:
+        """
+        Fetch commits for a repository, following pagination.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            since: Only commits after this date
+            until: Only commits before this date
+            per_page: Results per page (max 100)
+            branch: Specific branch to fetch from
+            use_most_recent_branch: If True, auto-detect most recently active branch
+            limit: Stop after this many commits (None fetches every page)
 
-        # Normalize to our schema
+        Returns:
+            List of commit objects with sha, message, date, author
+        """
         result = []
-        for commit in raw_commits:
-            result.append({
-                "sha": commit["sha"],
-                "message": commit["commit"]["message"],
-                "date": commit["commit"]["author"]["date"],
-                "author": commit["commit"]["author"]["name"],
-            })
+        commits = self.iter_commits(owner, repo, since, until, per_page, branch, use_most_recent_branch)
+        async with aclosing(commits):
+            async for commit in commits:
+                result.append(commit)
+                if limit and len(result) >= limit:
+                    break
         return result
 
+    async def prefetch_commits(self, repos: list[dict], since: datetime) -> None:
+        """
+        Hook for backends that can fetch many repos' commits in one request.
+
+        The REST backend fetches lazily per repo in iter_commits, so there is
+        nothing to batch here.
+
+        Args:
+            repos: Repo dicts (id, name, owner) that are about to be synced
+            since: Start of the commit window
+        """
+        return None
+
+    async def get_logins(self) -> list[str]:
+        """
+        Get the login of every account in the token pool.
+
+        Each token is asked for its own /user, so with GITHUB_TOKENS every
+        account's events feed can be polled, not just whichever token
+        happened to have the most quota left.
+        """
+        if not self.login_tokens:
+            for index in range(len(self.tokens)):
+                login = (await self.get("/user", token_index=index))["login"]
+                self.login_tokens.setdefault(login, index)
+        return list(self.login_tokens)
+
+    async def poll_events(self, username: str, org: str | None = None, per_page: int = 100) -> list[dict] | None:
+        """
+        Poll a user's (or their org's) events feed, honoring ETag and X-Poll-Interval.
+
+        Args:
+            username: GitHub username
+            org: Poll the user's view of this organization's events instead
+            per_page: Events per poll (max 100)
+
+        Returns:
+            Newest-first events, or None if the feed is unchanged (304) or
+            polled again before GitHub's X-Poll-Interval elapsed
+        """
+        endpoint = f"/users/{username}/events/orgs/{org}" if org else f"/users/{username}/events"
+        state = self._event_polls.setdefault(endpoint, {"etag": None, "next_poll": 0.0})
+        if time.time() < state["next_poll"]:
+            return None
+
+        headers = {"If-None-Match": state["etag"]} if state["etag"] else {}
+        # An account's own token also sees its private events
+        response = await self._send(
+            "GET", endpoint, token_index=self.login_tokens.get(username),
+            params={"per_page": per_page}, headers=headers
+        )
+        state["next_poll"] = time.time() + int(response.headers.get("X-Poll-Interval", 60))
+        if response.status_code == 304:
+            return None
+
+        response.raise_for_status()
+        state["etag"] = response.headers.get("ETag")
+        return response.json()
+
     async def get_rate_limit(self) -> dict:
         """Check current API rate limit status."""
         return await self.get("/rate_limit")
@@ -165,34 +697,33 @@ class GitHubClient:
 
 async def explore_repos():
     """Quick exploration script to see your repos."""
-    client = GitHubClient()
-
-    print("🔍 Fetching your repositories...\n")
+    async with GitHubClient() as client:
+        print("🔍 Fetching your repositories...\n")
 
-    # Get authenticated user's repos
-    repos = await client.get_repos()
+        # Get authenticated user's repos
+        repos = await client.get_repos()
 
-    print(f"Found {len(repos)} repositories:\n")
-    print(f"{'Repository':<40} {'Updated':<20} {'Language':<15} {'Stars'}")
-    print("-" * 90)
+        print(f"Found {len(repos)} repositories:\n")
+        print(f"{'Repository':<40} {'Updated':<20} {'Language':<15} {'Stars'}")
+        print("-" * 90)
 
-    for repo in repos[:20]:  # Show first 20
-        name = repo['name'][:38]
-        updated = repo['updated_at'][:10]
-        language = (repo['language'] or 'N/A')[:13]
-        stars = repo['stargazers_count']
+        for repo in repos[:20]:  # Show first 20
+            name = repo['name'][:38]
+            updated = repo['updated_at'][:10]
+            language = (repo['language'] or 'N/A')[:13]
+            stars = repo['stargazers_count']
 
-        print(f"{name:<40} {updated:<20} {language:<15} {stars}")
+            print(f"{name:<40} {updated:<20} {language:<15} {stars}")
 
-    print("\n" + "=" * 90)
+        print("\n" + "=" * 90)
 
-    # Show rate limit
-    rate_limit = await client.get_rate_limit()
-    core = rate_limit['resources']['core']
-    print(f"\n⚡ API Rate Limit: {core['remaining']}/{core['limit']} remaining")
-    print(f"   Resets at: {datetime.fromtimestamp(core['reset']).strftime('%H:%M:%S')}")
+        # Show rate limit
+        rate_limit = await client.get_rate_limit()
+        core = rate_limit['resources']['core']
+        print(f"\n⚡ API Rate Limit: {core['remaining']}/{core['limit']} remaining")
+        print(f"   Resets at: {datetime.fromtimestamp(core['reset']).strftime('%H:%M:%S')}")
 
-    return repos
+        return repos
 
 
 if __name__ == "__main__":
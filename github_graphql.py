@@ -0,0 +1,301 @@
+"""
+GraphQL backend for GitHubClient - batches the per-repo REST fan-out.
+"""
+from datetime import datetime, timezone
+from typing import AsyncIterator
+from github_client import GitHubClient
+
+
+# Map REST repo "type" filters to GraphQL ownerAffiliations
+AFFILIATIONS = {
+    "owner": "[OWNER]",
+    "member": "[ORGANIZATION_MEMBER, COLLABORATOR]",
+    "all": "[OWNER, ORGANIZATION_MEMBER, COLLABORATOR]",
+}
+
+HISTORY_FIELDS = """
+history(since: $since, first: 100%s) {
+  pageInfo { hasNextPage endCursor }
+  nodes { oid message author { name date } }
+}
+"""
+
+
+class GitHubGraphQLError(Exception):
+    """Raised when a GraphQL response carries errors and no data."""
+
+
+class GitHubGraphQLClient(GitHubClient):
+    """
+    GitHubClient backend that uses the GraphQL API.
+
+    One aliased query resolves the most recently active branch and its
+    30-day history for a whole batch of repos, replacing the REST
+    branches + commit-detail + commits calls per repo. Results keep the
+    normalized dict shapes of the REST backend.
+    """
+
+    def __init__(self, token: str | None = None, batch_size: int = 20, **kwargs):
+        """
+        Initialize GraphQL client.
+
+        Args:
+            token: GitHub personal access token (or set GITHUB_TOKEN env var)
+            batch_size: Repos resolved per aliased query
+            **kwargs: Connection pool options forwarded to GitHubClient
+        """
+        super().__init__(token, **kwargs)
+        self.batch_size = batch_size
+        self._prefetched: dict[tuple[str, str], list[dict]] = {}  # {(owner, name): commits}
+
+    async def graphql(self, query: str, variables: dict | None = None, token_index: int | None = None) -> dict:
+        """
+        Run a GraphQL query (read-only, so it is retried like a GET).
+
+        Args:
+            query: GraphQL document
+            variables: Query variables
+            token_index: Token to send with (default: routed by remaining quota)
+
+        Returns:
+            The "data" object of the response
+        """
+        response = await self._send(
+            "POST", "/graphql", resource="graphql", token_index=token_index, idempotent=True,
+            json={"query": query, "variables": variables or {}},
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        if payload.get("errors"):
+            if not payload.get("data"):
+                raise GitHubGraphQLError(payload["errors"][0].get("message", "GraphQL error"))
+            # Partial failure (e.g. one repo was deleted): keep the rest
+            for error in payload["errors"]:
+                print(f"Warning: GraphQL error: {error.get('message')}")
+        return payload["data"]
+
+    async def iter_repos(
+        self,
+        username: str | None = None,
+        type: str = "owner",
+        per_page: int = 100,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream user's repositories, most recently pushed first.
+
+        Args:
+            username: GitHub username (if None, fetches authenticated user's repos)
+            type: Repository type filter - "owner", "member" or "all"
+            per_page: Results per page (max 100)
+
+        Yields:
+            Repository objects with id, name, owner, language, updated_at
+        """
+        owner = "user(login: $login)" if username else "viewer"
+        login_var = ", $login: String!" if username else ""
+        query = f"""
+query($first: Int!, $after: String{login_var}) {{
+  owner: {owner} {{
+    repositories(first: $first, after: $after, ownerAffiliations: {AFFILIATIONS.get(type, AFFILIATIONS["owner"])},
+                 orderBy: {{field: PUSHED_AT, direction: DESC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{ databaseId name nameWithOwner owner {{ login }} primaryLanguage {{ name }} pushedAt }}
+    }}
+  }}
+}}
+"""
+        variables = {"first": per_page, "after": None}
+        if username:
+            variables["login"] = username
+
+        if username or len(self.tokens) == 1:
+            async for repo in self._list_repos(query, variables, None):
+                yield repo
+            return
+
+        # "viewer" is a different account per token: list each, then merge by recency
+        repos = []
+        for index in range(len(self.tokens)):
+            async for repo in self._list_repos(query, dict(variables), index):
+                repos.append(repo)
+        repos = list({repo["id"]: repo for repo in repos}.values())
+        repos.sort(key=lambda repo: repo["updated_at"] or "", reverse=True)
+        for repo in repos:
+            yield repo
+
+    async def _list_repos(self, query: str, variables: dict, token_index: int | None) -> AsyncIterator[dict]:
+        """Page through one repository listing, normalized to our schema."""
+        variables["after"] = None
+        while True:
+            data = await self.graphql(query, variables, token_index)
+            repositories = data["owner"]["repositories"]
+            for repo in repositories["nodes"]:
+                if token_index is not None:
+                    self.repo_tokens.setdefault(repo["nameWithOwner"], token_index)
+                yield {
+                    "id": repo["databaseId"],
+                    "name": repo["name"],
+                    "owner": repo["owner"]["login"],
+                    "language": (repo["primaryLanguage"] or {}).get("name"),
+                    "updated_at": repo["pushedAt"],
+                }
+
+            if not repositories["pageInfo"]["hasNextPage"]:
+                break
+            variables["after"] = repositories["pageInfo"]["endCursor"]
+
+    async def prefetch_commits(self, repos: list[dict], since: datetime) -> None:
+        """
+        Fetch the most recent branch's history for many repos in batches.
+
+        Each batch is one aliased query; repos whose history spans more than
+        one page are followed up with cursor queries for just those repos.
+
+        Args:
+            repos: Repo dicts (id, name, owner) that are about to be synced
+            since: Start of the commit window
+        """
+        # Batch per token, since private repos are only visible to their account
+        by_token: dict[int | None, list[dict]] = {}
+        for repo in repos:
+            by_token.setdefault(self.repo_tokens.get(f"{repo['owner']}/{repo['name']}"), []).append(repo)
+
+        for index, token_repos in by_token.items():
+            for start in range(0, len(token_repos), self.batch_size):
+                batch = token_repos[start:start + self.batch_size]
+                print(f"GraphQL: fetching commits for {len(batch)} repos in one query...")
+                pending = await self._fetch_heads(batch, since, index)
+
+                try:
+                    while pending:
+                        pending = await self._fetch_history_pages(pending, since, index)
+                except Exception:
+                    # Half-paged histories would pass for complete ones: let those repos use REST
+                    for state in pending:
+                        self._prefetched.pop(state["key"], None)
+                    raise
+
+    async def _fetch_heads(self, repos: list[dict], since: datetime, token_index: int | None) -> list[dict]:
+        """
+        Resolve each repo's most recently committed branch and first history page.
+
+        Returns:
+            Cursor state for repos that have more history pages
+        """
+        declarations = ["$since: GitTimestamp!"]
+        fields = []
+        variables = {"since": since.isoformat()}
+        for i, repo in enumerate(repos):
+            declarations += [f"$o{i}: String!", f"$n{i}: String!"]
+            variables[f"o{i}"] = repo["owner"]
+            variables[f"n{i}"] = repo["name"]
+            fields.append(f"""
+r{i}: repository(owner: $o{i}, name: $n{i}) {{
+  refs(refPrefix: "refs/heads/", first: 1, orderBy: {{field: TAG_COMMIT_DATE, direction: DESC}}) {{
+    nodes {{ name target {{ ... on Commit {{ {HISTORY_FIELDS % ""} }} }} }}
+  }}
+}}""")
+
+        query = f"query({', '.join(declarations)}) {{{''.join(fields)}\n}}"
+        data = await self.graphql(query, variables, token_index)
+
+        pending = []
+        for i, repo in enumerate(repos):
+            key = (repo["owner"], repo["name"])
+            node = data.get(f"r{i}")
+            if not node:
+                continue  # Failed for this repo (error entry): iter_commits falls back to REST
+            heads = node["refs"]["nodes"]
+            if not heads:
+                self._prefetched[key] = []  # No branches: genuinely no history
+                continue
+
+            branch = heads[0]["name"]
+            self.commit_branches[f"{repo['owner']}/{repo['name']}"] = branch
+            history = heads[0]["target"]["history"]
+            self._prefetched[key] = self._normalize(history["nodes"])
+            if history["pageInfo"]["hasNextPage"]:
+                pending.append({
+                    "key": key,
+                    "branch": f"refs/heads/{branch}",
+                    "cursor": history["pageInfo"]["endCursor"],
+                })
+        return pending
+
+    async def _fetch_history_pages(self, pending: list[dict], since: datetime, token_index: int | None) -> list[dict]:
+        """
+        Fetch the next history page for every repo in pending in one query.
+
+        Returns:
+            Cursor state for repos that still have more pages
+        """
+        declarations = ["$since: GitTimestamp!"]
+        fields = []
+        variables = {"since": since.isoformat()}
+        for i, state in enumerate(pending):
+            owner, name = state["key"]
+            declarations += [f"$o{i}: String!", f"$n{i}: String!", f"$b{i}: String!", f"$c{i}: String!"]
+            variables.update({f"o{i}": owner, f"n{i}": name, f"b{i}": state["branch"], f"c{i}": state["cursor"]})
+            fields.append(f"""
+r{i}: repository(owner: $o{i}, name: $n{i}) {{
+  ref(qualifiedName: $b{i}) {{ target {{ ... on Commit {{ {HISTORY_FIELDS % f", after: $c{i}"} }} }} }}
+}}""")
+
+        query = f"query({', '.join(declarations)}) {{{''.join(fields)}\n}}"
+        data = await self.graphql(query, variables, token_index)
+
+        still_pending = []
+        for i, state in enumerate(pending):
+            node = data.get(f"r{i}")
+            if not node or not node["ref"]:
+                # Incomplete history: drop it so iter_commits falls back to REST
+                self._prefetched.pop(state["key"], None)
+                continue
+            history = node["ref"]["target"]["history"]
+            self._prefetched[state["key"]].extend(self._normalize(history["nodes"]))
+            if history["pageInfo"]["hasNextPage"]:
+                still_pending.append({**state, "cursor": history["pageInfo"]["endCursor"]})
+        return still_pending
+
+    def _normalize(self, nodes: list[dict]) -> list[dict]:
+        """Convert GraphQL commit nodes to the REST backend's commit shape."""
+        return [
+            {
+                "sha": node["oid"],
+                "message": node["message"],
+                # GitTimestamp carries the author's offset; store UTC like REST does
+                "date": datetime.fromisoformat(node["author"]["date"])
+                .astimezone(timezone.utc)
+                .strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "author": node["author"]["name"],
+            }
+            for node in nodes
+        ]
+
+    async def iter_commits(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        per_page: int = 100,
+        branch: str | None = None,
+        use_most_recent_branch: bool = False
+    ) -> AsyncIterator[dict]:
+        """
+        Yield prefetched commits, falling back to the REST backend.
+
+        Prefetched results are consumed once, so the next sync fetches
+        fresh data.
+        """
+        prefetched = self._prefetched.pop((owner, repo), None)
+        if prefetched is not None and use_most_recent_branch and until is None:
+            for commit in prefetched:
+                yield commit
+            return
+
+        async for commit in super().iter_commits(
+            owner, repo, since, until, per_page, branch, use_most_recent_branch
+        ):
+            yield commit
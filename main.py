@@ -23,7 +23,12 @@ async def main(as_of: datetime | None = None):
     print("=" * 80 + "\n")
 
     # Initialize components
-    github = GitHubClient()
+    async with GitHubClient() as github:
+        await _run(github, as_of)
+
+
+async def _run(github: GitHubClient, as_of: datetime):
+    """Sync commits, build the board and print it using an open client."""
     agent = CommitAgent(github, as_of=as_of)
 
     # Try to load existing cache
@@ -42,6 +47,7 @@ async def main(as_of: datetime | None = None):
     # Sync commits and generate summaries
     print("Syncing commits and generating AI summaries...\n")
     await agent.sync_repos(repos)
+    await agent.summaries.join()
 
     # Save cache for next time
     agent.save_cache()
@@ -69,9 +75,11 @@ async def main(as_of: datetime | None = None):
 
     print("=" * 80)
 
-    # Show rate limit
-    rate_info = await github.get_rate_limit()
-    core = rate_info["resources"]["core"]
+    # Show rate limit (live state from response headers, summed over the token
+    # pool; /rate_limit if nothing was sent)
+    core = github.rate_limit_budget()["total"].get("core")
+    if core is None:
+        core = (await github.get_rate_limit())["resources"]["core"]
     print(f"\nAPI Rate Limit: {core['remaining']}/{core['limit']} remaining")
     print(f"Resets at: {datetime.fromtimestamp(core['reset']).strftime('%H:%M:%S')}")
 
@@ -0,0 +1,178 @@
+"""
+RateLimitScheduler - Paces GitHub requests from the rate-limit headers.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+import httpx
+
+
+# Priority lanes: interactive requests (e.g. /api/refresh) go first,
+# background refreshes wait while any interactive request is queued
+INTERACTIVE = 0
+BACKGROUND = 1
+
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(lane: int):
+    """Run every GitHub request made inside this block in the given lane."""
+    token = request_priority.set(lane)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class RateLimitExceeded(Exception):
+    """Raised instead of waiting longer than max_backoff for the quota to reset."""
+
+
+class RateLimitScheduler:
+    """
+    Token bucket refilled at the rate the remaining quota allows.
+
+    The bucket holds `burst` requests (or a tenth of the remaining quota,
+    if larger) and refills at remaining / seconds-until-reset, so a full
+    refresh can run immediately while sustained traffic is spread evenly
+    over the rate-limit window. State comes from the X-RateLimit-* and
+    Retry-After headers of every response.
+    """
+
+    def __init__(self, burst: int = 100, reserve: int = 50, max_backoff: float = 300.0):
+        """
+        Initialize scheduler.
+
+        Args:
+            burst: Requests that may be sent back-to-back
+            reserve: Remaining quota kept back from background requests
+            max_backoff: Longest wait (seconds) before a limited request gives up
+        """
+        self.burst = burst
+        self.reserve = reserve
+        self.max_backoff = max_backoff
+
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None  # Epoch seconds
+        self.blocked_until = 0.0  # Epoch seconds, set by Retry-After / 429s
+
+        self.tokens = float(burst)
+        self.last_refill = time.time()
+        self.waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+
+    async def acquire(self, lane: int | None = None) -> None:
+        """
+        Wait until a request may be sent, then consume one token.
+
+        Args:
+            lane: INTERACTIVE or BACKGROUND (default: the current request_priority)
+
+        Raises:
+            RateLimitExceeded: The wait would exceed max_backoff (e.g. quota exhausted until reset)
+        """
+        lane = request_priority.get() if lane is None else lane
+        self.waiting[lane] += 1
+        try:
+            while (delay := self._delay(lane)) > 0:
+                if delay > self.max_backoff:
+                    raise RateLimitExceeded(f"Rate limit exhausted, resets in {delay:.0f}s")
+                # Re-check at least every second so interactive work can preempt
+                await asyncio.sleep(min(delay, 1.0))
+            self.tokens -= 1
+            if self.remaining is not None:
+                self.remaining -= 1
+        finally:
+            self.waiting[lane] -= 1
+
+    def _delay(self, lane: int) -> float:
+        """Seconds to wait before a request in this lane may be sent."""
+        now = time.time()
+        self._refill(now)
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if lane == BACKGROUND:
+            if self.waiting[INTERACTIVE]:
+                return 0.05
+            if self.remaining is not None and self.remaining <= self.reserve and self.reset_at:
+                return max(self.reset_at - now, 0.05)
+        if self.remaining == 0 and self.reset_at:
+            return max(self.reset_at - now, 0.05)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self._refill_rate(now)
+
+    def _refill_rate(self, now: float) -> float:
+        """Tokens per second that spend the remaining quota evenly until reset."""
+        if self.remaining is None or not self.reset_at:
+            return float(self.burst)  # No headers seen yet: refill a full bucket per second
+        return max(self.remaining, 1) / max(self.reset_at - now, 1.0)
+
+    def _capacity(self) -> float:
+        """Bucket size: bursts may grow while plenty of quota is left."""
+        return max(self.burst, (self.remaining or 0) / 10)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self._capacity(), self.tokens + (now - self.last_refill) * self._refill_rate(now))
+        self.last_refill = now
+
+    def update(self, response: httpx.Response) -> None:
+        """Record the rate-limit state reported by a response."""
+        headers = response.headers
+        if "X-RateLimit-Remaining" in headers:
+            first_report = self.remaining is None
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+            if first_report:
+                # Start with a full bucket sized to the quota GitHub reports
+                self.tokens = max(self.tokens, self._capacity())
+        if "X-RateLimit-Limit" in headers:
+            self.limit = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Reset" in headers:
+            self.reset_at = float(headers["X-RateLimit-Reset"])
+
+    def backoff(self, response: httpx.Response, attempt: int) -> float | None:
+        """
+        Work out how long to back off after a rate-limited response.
+
+        Args:
+            response: Response to inspect
+            attempt: Zero-based retry attempt for this request
+
+        Returns:
+            Seconds to wait before retrying, or None if not rate limited
+            (or if the wait would exceed max_backoff)
+        """
+        if response.status_code not in (403, 429):
+            return None
+
+        now = time.time()
+        if "Retry-After" in response.headers:
+            delay = float(response.headers["Retry-After"])
+        elif response.headers.get("X-RateLimit-Remaining") == "0" and self.reset_at:
+            delay = self.reset_at - now
+        elif response.status_code == 429 or "rate limit" in response.text.lower():
+            # Secondary limit without a hint: GitHub asks for at least a minute
+            delay = 60.0 * 2 ** attempt
+        else:
+            return None  # Plain permission error
+
+        if delay > self.max_backoff:
+            return None
+        self.blocked_until = max(self.blocked_until, now + delay)
+        return delay
+
+    def budget(self) -> dict:
+        """Live rate-limit state, for callers planning how much work to do."""
+        now = time.time()
+        self._refill(now)
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset": self.reset_at,
+            "blocked_for": max(self.blocked_until - now, 0.0),
+            "tokens": round(self.tokens, 2),
+            "waiting": {"interactive": self.waiting[INTERACTIVE], "background": self.waiting[BACKGROUND]},
+        }
@@ -0,0 +1,88 @@
+"""
+Retry backoff and circuit breaking for GitHub requests.
+"""
+import random
+import time
+
+
+# Statuses worth retrying: GitHub is degraded, not refusing the request
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Capped exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay ceiling of the first retry, in seconds
+        cap: Largest delay ceiling, in seconds
+
+    Returns:
+        Seconds to sleep, uniformly drawn from [0, min(cap, base * 2^attempt)]
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a host's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a host keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests raise CircuitOpenError for `reset_timeout` seconds. Then a
+    single probe request is let through (half-open): success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            host: Host name, for error messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing again
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half-open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        state = self.state
+        if state == "open" or (state == "half-open" and self.probing):
+            retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise CircuitOpenError(f"Circuit open for {self.host}, retry in {max(retry_in, 0):.0f}s")
+        if state == "half-open":
+            self.probing = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def release_probe(self) -> None:
+        """Give up a probe that ended without an outcome (e.g. cancelled), so another can be sent."""
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
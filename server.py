@@ -3,15 +3,21 @@ FastAPI web server for GitDash dashboard.
 """
 import os
 import asyncio
+import hashlib
+import hmac
 from datetime import datetime
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
 from github_client import GitHubClient
+from github_graphql import GitHubGraphQLClient
 from commit_agent import CommitAgent
+from cache_persister import CachePersister
+from commit_store import open_store
 from board import Board
+from rate_limit import BACKGROUND, priority
 
 
 # Global state
@@ -19,6 +25,20 @@ dashboard_data = None
 last_refresh = None
 github_client = None
 commit_agent = None
+persister = None
+current_repos = None  # Repo list behind dashboard_data
+
+# GITDASH_SYNC=events polls the events feed and only lists repos when something moved
+EVENTS_SYNC = os.getenv("GITDASH_SYNC") == "events"
+EVENT_ORGS = tuple(org for org in os.getenv("GITDASH_EVENT_ORGS", "").split(",") if org)
+
+# Cache file per GITDASH_STORE backend
+STORE_FILES = {"sqlite": "cache.db", "journal": "cache.journal", "columnar": "cache.gdc"}
+
+
+def token_configured() -> bool:
+    """Check whether a GitHub token (or token pool) is configured."""
+    return bool(os.getenv("GITHUB_TOKEN") or os.getenv("GITHUB_TOKENS"))
 
 
 async def background_refresh_task():
@@ -28,9 +48,11 @@ async def background_refresh_task():
     while True:
         try:
             await asyncio.sleep(60)  # Wait 1 minute
-            if os.getenv("GITHUB_TOKEN"):
+            if token_configured():
                 print("Background refresh triggered...")
-                await refresh_dashboard(limit=15)
+                # Yield the rate-limit budget to interactive refreshes
+                with priority(BACKGROUND):
+                    await refresh_dashboard(limit=15)
         except Exception as e:
             print(f"Background refresh error: {e}")
 
@@ -38,19 +60,41 @@ async def background_refresh_task():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize on startup."""
-    global github_client, commit_agent
+    global github_client, commit_agent, persister
 
     # Check for GitHub token
-    if not os.getenv("GITHUB_TOKEN"):
+    if not token_configured():
         print("WARNING: GITHUB_TOKEN not set. Set it before making API calls.")
 
-    # Initialize clients
-    github_client = GitHubClient()
-    commit_agent = CommitAgent(github_client)
+    # Initialize clients (GITDASH_BACKEND=graphql batches the per-repo fan-out)
+    if os.getenv("GITDASH_BACKEND") == "graphql":
+        github_client = GitHubGraphQLClient()
+    else:
+        github_client = GitHubClient()
+    # GITDASH_STORE=sqlite|journal only writes what changed, columnar maps a
+    # compact binary file at load (default: cache.json)
+    store = open_store(STORE_FILES.get(os.getenv("GITDASH_STORE"), "cache.json"))
+    commit_agent = CommitAgent(
+        github_client,
+        store=store,
+        max_repos=int(os.getenv("GITDASH_CACHE_MAX_REPOS", "100")),
+        max_commits=int(os.getenv("GITDASH_CACHE_MAX_COMMITS", "20000")),
+        sync_concurrency=int(os.getenv("GITDASH_SYNC_CONCURRENCY", "8")),
+        repo_timeout=float(os.getenv("GITDASH_REPO_TIMEOUT", "120")),
+        summary_concurrency=int(os.getenv("GITDASH_SUMMARY_CONCURRENCY", "2")),
+        summary_timeout=float(os.getenv("GITDASH_SUMMARY_TIMEOUT", "60")),
+        summary_batch=int(os.getenv("GITDASH_SUMMARY_BATCH", "8")),
+    )
+    # Summaries are generated in worker threads and land on the board as they finish
+    commit_agent.summaries.on_done = publish_summary
 
     # Load cache if exists
     commit_agent.load_cache()
 
+    # Cache writes happen behind the scenes, off the event loop
+    persister = CachePersister(commit_agent)
+    persister.start()
+
     # Start background refresh task
     refresh_task = asyncio.create_task(background_refresh_task())
 
@@ -59,6 +103,10 @@ async def lifespan(app: FastAPI):
 
     # Cancel background task on shutdown
     refresh_task.cancel()
+    await commit_agent.summaries.close()
+    await persister.close()
+    await github_client.aclose()
+    store.close()
     print("GitDash server shutting down")
 
 
@@ -67,22 +115,40 @@ app = FastAPI(title="GitDash", lifespan=lifespan)
 
 async def refresh_dashboard(limit: int = None):
     """Refresh dashboard data from GitHub."""
-    global dashboard_data, last_refresh
-
-    if not os.getenv("GITHUB_TOKEN"):
+    if not token_configured():
         raise HTTPException(status_code=500, detail="GITHUB_TOKEN not set")
 
     # Update agent's as_of time to current time
     commit_agent.as_of = datetime.now()
 
+    if EVENTS_SYNC and current_repos is not None:
+        touched = await commit_agent.sync_events(await github_client.get_logins(), EVENT_ORGS)
+        if touched is not None and not touched:
+            # Nothing moved: no repo listing, no commit fetches
+            return await publish_dashboard(current_repos)
+
     # Fetch repos
     repos = await github_client.get_repos(limit=limit)
 
     # Sync commits
     await commit_agent.sync_repos(repos)
 
-    # Save cache
-    commit_agent.save_cache()
+    if EVENTS_SYNC and current_repos is None:
+        # Prime the feed cursors so the next refresh can go incremental
+        await commit_agent.sync_events(await github_client.get_logins(), EVENT_ORGS)
+
+    return await publish_dashboard(repos)
+
+
+async def publish_dashboard(repos: list[dict]) -> dict:
+    """Persist the cache and rebuild dashboard_data from it."""
+    global dashboard_data, last_refresh, current_repos
+
+    # Expire old commits and evict repos off the dashboard beyond the limits
+    commit_agent.trim_cache({str(repo["id"]) for repo in repos})
+
+    # Save cache (debounced, in a worker thread)
+    persister.mark_dirty()
 
     # Generate board
     board = Board(repos, commit_agent, as_of=datetime.now())
@@ -95,10 +161,40 @@ async def refresh_dashboard(limit: int = None):
         "repo_count": len(repos)
     }
     last_refresh = datetime.now()
+    current_repos = repos
 
     return dashboard_data
 
 
+def publish_row(repo_id: str) -> None:
+    """Recompute one project's row of dashboard_data in place."""
+    global last_refresh
+
+    repo = next((r for r in current_repos or [] if str(r["id"]) == repo_id), None)
+    if repo is None or dashboard_data is None:
+        return  # Not on the dashboard: the next refresh picks it up
+
+    row = Board([repo], commit_agent, as_of=datetime.now()).get_row(repo)
+    # By url: repos of different owners can share a name
+    projects = [p for p in dashboard_data["projects"] if p["url"] != row["url"]] + [row]
+    projects.sort(key=lambda p: p["weight"], reverse=True)
+    dashboard_data["projects"] = projects
+    dashboard_data["timestamp"] = datetime.now().isoformat()
+    last_refresh = datetime.now()
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check a webhook's X-Hub-Signature-256 header against the raw body."""
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return signature is not None and hmac.compare_digest(expected, signature)
+
+
+def publish_summary(repo_id: str) -> None:
+    """Show a freshly generated summary and schedule it for saving."""
+    publish_row(repo_id)
+    persister.mark_dirty()
+
+
 @app.get("/")
 async def root():
     """Serve the dashboard HTML page."""
@@ -612,6 +708,32 @@ async def refresh():
     return await refresh_dashboard(limit=15)
 
 
+@app.post("/api/webhook/github")
+async def github_webhook(request: Request):
+    """Ingest push webhooks: merge the commits and update that repo's row."""
+    secret = os.getenv("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        raise HTTPException(status_code=500, detail="GITHUB_WEBHOOK_SECRET not set")
+
+    body = await request.body()
+    if not verify_signature(secret, body, request.headers.get("X-Hub-Signature-256")):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    event = request.headers.get("X-GitHub-Event")
+    if event != "push":
+        return {"status": "ignored", "event": event}
+
+    commit_agent.as_of = datetime.now()
+    repo_id = commit_agent.apply_push(await request.json())
+    if repo_id is None:
+        return {"status": "unchanged"}
+
+    commit_agent.request_summary(repo_id)  # Immediate if these commits were summarized before
+    publish_row(repo_id)
+    persister.mark_dirty()
+    return {"status": "updated", "repo_id": repo_id}
+
+
 @app.get("/api/status")
 async def status():
     """Get server status."""
@@ -619,7 +741,14 @@ async def status():
         "status": "ok",
         "last_refresh": last_refresh.isoformat() if last_refresh else None,
         "has_data": dashboard_data is not None,
-        "github_token_set": bool(os.getenv("GITHUB_TOKEN"))
+        "github_token_set": token_configured(),
+        "rate_limit": github_client.rate_limit_budget() if github_client else None,
+        "requests": github_client.request_stats if github_client else None,
+        "circuits": {host: b.state for host, b in github_client.breakers.items()} if github_client else None,
+        "persistence": persister.status() if persister else None,
+        "cache": commit_agent.cache_status() if commit_agent else None,
+        "summaries": commit_agent.summaries.status() if commit_agent else None,
+        "summary_cache": commit_agent.summary_cache.status() if commit_agent else None
     }
 
 
@@ -0,0 +1,96 @@
+"""
+SummaryCache - AI summaries keyed by the commits they summarize.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+
+class SummaryCache:
+    """
+    Content-addressed, LRU-bounded store of generated summaries.
+
+    The key hashes exactly what the LLM is shown (repo name, then each
+    commit's sha and message), so a repo whose latest commits did not change
+    - a push to another branch, a force-push of the same history, a refetch
+    after eviction - reuses its summary instead of paying for a new call.
+    Entries persist to a JSON file, least recently used first.
+    """
+
+    def __init__(self, path: str = "summaries.json", max_entries: int = 2000):
+        """
+        Initialize cache.
+
+        Args:
+            path: JSON file the entries are persisted to
+            max_entries: Summaries kept; the least recently used are evicted beyond this
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.dirty = False
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    @staticmethod
+    def key(repo_name: str, commits) -> str:
+        """Hash of the summarizer's input: repo name and the commits' shas and messages."""
+        digest = hashlib.sha256(repo_name.encode())
+        for commit in commits:
+            digest.update(b"\0" + commit["sha"].encode() + b"\0" + commit["message"].encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Cached summary for a key, or None."""
+        summary = self.entries.get(key)
+        if summary is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.entries.move_to_end(key)
+        self.dirty = True  # Recency is persisted too
+        return summary
+
+    def put(self, key: str, summary: str) -> None:
+        """Store a summary, evicting the least recently used beyond max_entries."""
+        self.entries[key] = summary
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evicted"] += 1
+        self.dirty = True
+
+    def load(self) -> None:
+        """Read persisted entries, if any."""
+        path = Path(self.path)
+        if not path.exists():
+            return
+        with open(path, "r") as f:
+            self.entries = OrderedDict(json.load(f)[-self.max_entries:])
+        self.dirty = False
+
+    def snapshot(self) -> list | None:
+        """Entries to persist, or None if nothing changed since the last snapshot."""
+        if not self.dirty:
+            return None
+        self.dirty = False
+        return list(self.entries.items())
+
+    def write(self, entries: list) -> None:
+        """Persist a snapshot (safe to run in a worker thread)."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def save(self) -> None:
+        """Persist the entries if they changed."""
+        entries = self.snapshot()
+        if entries is not None:
+            self.write(entries)
+
+    def status(self) -> dict:
+        return {**self.stats, "entries": len(self.entries)}
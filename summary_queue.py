@@ -0,0 +1,232 @@
+"""
+SummaryQueue - Background AI summary generation for the CommitAgent cache.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Callable
+
+
+class SummaryQueue:
+    """
+    Worker pool that regenerates repo summaries off the event loop.
+
+    enqueue() only records the repo id; a repo queued again before a worker
+    picks it up shares the pending job. Workers read the repo's latest
+    commits when they start, reuse a summary the agent's summary cache
+    already holds for them, or else run the blocking LLM call on a pool of
+    `concurrency` threads and write the result back to the cache. A call
+    that takes longer than `timeout` after a thread picks it up is given up:
+    the worker moves on, but the call keeps its thread until it returns, and
+    later calls wait for a free thread instead of starting new ones. A
+    failed or timed-out call never replaces a summary the repo already has.
+
+    With batch_size > 1 a worker takes up to that many queued repos at once
+    and asks for all their summaries in one structured request, split by an
+    estimated token budget. Repos a batch does not cover (failed call,
+    response not matching the schema, missing entries) fall back to one
+    request each.
+    """
+
+    def __init__(self, agent, concurrency: int = 2, timeout: float = 60.0,
+                 batch_size: int = 1, batch_tokens: int = 3000,
+                 on_done: Callable[[str], None] | None = None):
+        """
+        Initialize queue.
+
+        Args:
+            agent: CommitAgent whose cache entries to summarize
+            concurrency: Summaries generated at the same time
+            timeout: Seconds one LLM call may take
+            batch_size: Queued repos a worker takes at once and summarizes in one request
+            batch_tokens: Estimated prompt tokens per batched request; larger batches are split
+            on_done: Called with the repo id after its summary is written
+        """
+        self.agent = agent
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.batch_tokens = batch_tokens
+        self.on_done = on_done
+        self.stats = {
+            "generated": 0,
+            "coalesced": 0,  # Requests absorbed by an already queued job
+            "llm_calls": 0,
+            "batches": 0,  # Calls that summarized more than one repo
+            "batch_fallbacks": 0,  # Repos a batch failed to cover, summarized on their own
+            "timeouts": 0,
+            "abandoned": 0,  # Timed-out calls still holding a thread
+            "last_call_seconds": None,
+        }
+        self._queue: asyncio.Queue | None = None
+        self._queued: set[str] = set()
+        self._workers: list[asyncio.Task] = []
+        self._executor: ThreadPoolExecutor | None = None
+
+    def enqueue(self, repo_id: str) -> None:
+        """Schedule a summary for a repo, starting the workers on first use."""
+        if repo_id in self._queued:
+            self.stats["coalesced"] += 1
+            return
+        if self._queue is None:
+            self._start()
+        self._queued.add(repo_id)
+        self._queue.put_nowait(repo_id)
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="summary")
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def _work(self) -> None:
+        while True:
+            repo_ids = [await self._queue.get()]
+            while len(repo_ids) < self.batch_size and not self._queue.empty():
+                repo_ids.append(self._queue.get_nowait())
+            try:
+                self._queued.difference_update(repo_ids)
+                await self._summarize(repo_ids)
+            except Exception as e:
+                print(f"Summary failed for {', '.join(repo_ids)}: {e}")
+            finally:
+                for _ in repo_ids:
+                    self._queue.task_done()
+
+    async def _summarize(self, repo_ids: list[str]) -> None:
+        pending = []  # (repo_id, name, commits, key) still needing an LLM call
+        for repo_id in repo_ids:
+            entry = self.agent.cache.get(repo_id)
+            if entry is None or not entry["commits"]:
+                continue  # Evicted or emptied since it was queued
+            key = self.agent.summary_key(repo_id)
+            summary = self.agent.summary_cache.entries.get(key)  # Another job may have produced it meanwhile
+            if summary is not None:
+                self._finish(repo_id, summary)
+                continue
+            pending.append((repo_id, entry.get("name", repo_id), list(entry["commits"][:5]), key))
+
+        for chunk in self._chunks(pending):
+            if len(chunk) > 1:
+                chunk = await self._summarize_batch(chunk)
+            for repo_id, name, commits, key in chunk:
+                self._finish(repo_id, *await self._summarize_one(name, commits, key))
+
+    def _chunks(self, pending: list[tuple]) -> list[list[tuple]]:
+        """Split jobs into requests of at most batch_tokens estimated prompt tokens."""
+        chunks, tokens = [], 0
+        for job in pending:
+            _, name, commits, _ = job
+            # ~4 characters per token, plus the per-repo framing
+            estimate = (len(name) + sum(len(commit["message"]) for commit in commits)) // 4 + 20
+            if not chunks or tokens + estimate > self.batch_tokens:
+                chunks.append([])
+                tokens = 0
+            chunks[-1].append(job)
+            tokens += estimate
+        return chunks
+
+    async def _summarize_batch(self, chunk: list[tuple]) -> list[tuple]:
+        """Summarize a chunk in one request; returns the jobs it did not cover."""
+        repos = [(repo_id, name, commits) for repo_id, name, commits, _ in chunk]
+        try:
+            summaries = await self._call(self.agent._generate_summaries, repos)
+        except TimeoutError:
+            self.stats["timeouts"] += 1
+            summaries = {}
+        except Exception as e:
+            print(f"Batched summary failed, falling back to one request per repo: {e}")
+            summaries = {}
+        self.stats["batches"] += 1
+
+        missing = []
+        for job in chunk:
+            repo_id, _, _, key = job
+            if repo_id in summaries:
+                self.agent.summary_cache.put(key, summaries[repo_id])
+                self._finish(repo_id, summaries[repo_id])
+            else:
+                missing.append(job)
+        self.stats["batch_fallbacks"] += len(missing)
+        return missing
+
+    async def _summarize_one(self, name: str, commits: list, key: str) -> tuple[str, bool]:
+        """Summarize one repo; returns the summary (or error text) and whether the call failed."""
+        try:
+            summary = await self._call(self.agent._generate_summary, name, commits)
+        except TimeoutError:
+            self.stats["timeouts"] += 1
+            return "Summary generation timed out", True
+        except Exception as e:
+            return f"Summary generation failed: {str(e)}", True
+        self.agent.summary_cache.put(key, summary)
+        return summary, False
+
+    async def _call(self, fn, *args):
+        """Run a blocking LLM call on the thread pool, giving up after `timeout` from its start."""
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def run():
+            with suppress(RuntimeError):  # Loop closed while the call waited
+                loop.call_soon_threadsafe(started.set)
+            return fn(*args)
+
+        def released():
+            self.stats["abandoned"] -= 1
+
+        def on_return(_):
+            with suppress(RuntimeError):  # Loop closed before the call returned
+                loop.call_soon_threadsafe(released)
+
+        self.stats["llm_calls"] += 1
+        job = self._executor.submit(run)
+        # Queued while every thread is busy (e.g. with abandoned calls); the
+        # timeout only covers the call itself
+        try:
+            await started.wait()
+        except asyncio.CancelledError:
+            job.cancel()  # Dropped if no thread picked it up yet
+            raise
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), self.timeout)
+        except TimeoutError:
+            self.stats["abandoned"] += 1
+            job.add_done_callback(on_return)
+            raise
+        finally:
+            self.stats["last_call_seconds"] = round(time.perf_counter() - start, 4)
+
+    def _finish(self, repo_id: str, summary: str, failed: bool = False) -> None:
+        if repo_id not in self.agent.cache:
+            return  # Evicted while the call ran
+        if failed and self.agent.cache[repo_id].get("summary"):
+            return  # Keep the previous summary; the next request retries
+        self.agent.set_summary(repo_id, summary)
+        self.stats["generated"] += 1
+        if self.on_done is not None:
+            self.on_done(repo_id)
+
+    async def join(self) -> None:
+        """Wait until every queued summary has been written."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Stop the workers, dropping queued jobs (calls in flight finish in their threads)."""
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with suppress(asyncio.CancelledError):
+                await worker
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._queued.clear()
+        self._queue = None
+
+    def status(self) -> dict:
+        """Summary stats plus the number of jobs waiting."""
+        return {**self.stats, "queued": len(self._queued)}
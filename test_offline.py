@@ -0,0 +1,734 @@
+"""
+Offline checks of the refresh pipeline against fake_github.py.
+"""
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+from bench_refresh import refresh, serve_fake_github
+from fake_github import FakeGitHubConfig
+from github_client import GitHubClient
+from github_graphql import GitHubGraphQLClient
+from rate_limit import BACKGROUND, RateLimitExceeded, priority
+from commit_agent import CommitAgent, CommitSummaryBatch
+from commit_record import parse_epoch
+from cache_persister import CachePersister, LoopLagMonitor
+from commit_store import ColumnarCommitStore, JournalCommitStore, JsonCommitStore, SqliteCommitStore
+from board import Board
+from summary_cache import SummaryCache
+from webhook_client import post_push, push_payload
+import httpx
+import server
+
+
+async def test_pagination():
+    """Repos and commits beyond one page of 100 are not truncated."""
+    config = FakeGitHubConfig(repos=130, commits=250, branches=1, days=20)
+    async with serve_fake_github(config) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            repos = await github.get_repos()
+            assert len(repos) == 130, len(repos)
+
+            commits = await github.get_commits(
+                owner=config.owner, repo=repos[0]["name"], since=datetime.now() - timedelta(days=30)
+            )
+            assert len(commits) == 250, len(commits)
+    print("✓ pagination: 130 repos, 250 commits")
+
+
+async def test_conditional_requests():
+    """Unchanged resources come back as 304s."""
+    async with serve_fake_github(FakeGitHubConfig(repos=5)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            first = await github.get_repos()
+            second = await github.get_repos()
+            assert first == second
+            assert fake.not_modified == 1, fake.not_modified
+    print("✓ conditional requests: second listing was a 304")
+
+
+async def test_retries_transient_errors():
+    """Injected 502s are retried instead of failing the refresh."""
+    config = FakeGitHubConfig(repos=10, commits=20, error_rate=0.2, seed=1)
+    async with serve_fake_github(config) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url, max_retries=6) as github:
+            agent = CommitAgent(github, summarize=False)
+            projects = await refresh(github, agent, limit=10)
+            assert len(projects) == 10
+            assert all(agent.get_commits(repo_id) for repo_id in agent.cache), "a repo failed to sync"
+    print("✓ retries: refresh completed with 20% injected 502s")
+
+
+def graphql_handler(request: httpx.Request) -> httpx.Response:
+    """/graphql stand-in: "long" has two history pages, "gone" fails, "bare" has no branches."""
+    variables = json.loads(request.content)["variables"]
+    data, errors = {}, []
+    for var, name in variables.items():
+        if not var.startswith("n"):
+            continue
+        alias, cursor = "r" + var[1:], variables.get("c" + var[1:])
+        if name == "gone":
+            data[alias] = None
+            errors.append({"message": f"Could not resolve to a Repository with the name '{name}'."})
+            continue
+        if name == "bare":
+            data[alias] = {"refs": {"nodes": []}}
+            continue
+        page = 1 if cursor else 0
+        history = {
+            "pageInfo": {"hasNextPage": name == "long" and not cursor, "endCursor": "page-2"},
+            "nodes": [{"oid": f"{name}-{page}", "message": "work", "author": {"name": "dev", "date": "2026-10-01T12:00:00+02:00"}}],
+        }
+        if cursor:
+            data[alias] = {"ref": {"target": {"history": history}}}
+        else:
+            data[alias] = {"refs": {"nodes": [{"name": "main", "target": {"history": history}}]}}
+    return httpx.Response(200, json={"data": data, "errors": errors})
+
+
+async def test_exhausted_quota():
+    """An exhausted quota fails fast instead of waiting for the reset."""
+    async with serve_fake_github(FakeGitHubConfig(repos=3, rate_limit=2, etags=False)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            await github.get_repos()
+            await github.get_repos()  # Spends the last request; GitHub reports a reset an hour away
+            start = time.perf_counter()
+            try:
+                await github.get_repos()
+                raise AssertionError("request waited for the quota reset")
+            except RateLimitExceeded:
+                pass
+            assert time.perf_counter() - start < 1
+    print("✓ exhausted quota: request raised instead of waiting an hour for the reset")
+
+
+async def test_circuit_probe_cancelled():
+    """A cancelled half-open probe does not leave the circuit failing fast forever."""
+    async def handler(request):
+        if request.url.path == "/slow":
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    async with GitHubClient(token="fake", transport=httpx.MockTransport(handler)) as github:
+        breaker = github.breaker("/user")
+        breaker.reset_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        assert breaker.state == "half-open"
+        try:
+            async with asyncio.timeout(0.1):
+                await github._send("GET", "/slow")  # The probe, cancelled mid-flight
+        except TimeoutError:
+            pass
+        response = await github._send("GET", "/user")  # Probes again instead of CircuitOpenError
+        assert response.status_code == 200 and breaker.state == "closed"
+    print("✓ circuit probe: a cancelled probe is released, the next request closes the circuit")
+
+
+POOL_ACCOUNTS = {
+    # token: [(repo id, owner, name, pushed_at)], each account's listing newest first
+    "token-a": [(2, "alice", "shared", "2026-10-05T00:00:00Z"), (1, "alice", "a-old", "2026-09-01T00:00:00Z")],
+    "token-b": [(3, "bob", "b-new", "2026-10-10T00:00:00Z"), (2, "alice", "shared", "2026-10-05T00:00:00Z")],
+}
+POOL_LOGINS = {"token-a": "alice", "token-b": "bob"}
+
+
+def pool_handler(request: httpx.Request) -> httpx.Response:
+    """/user, /user/repos, the GraphQL viewer listing and own events feeds, answered per token."""
+    token = request.headers["Authorization"].removeprefix("Bearer ")
+    repos = POOL_ACCOUNTS[token]
+    if request.url.path == "/user":
+        return httpx.Response(200, json={"login": POOL_LOGINS[token]})
+    if request.url.path.startswith("/users/"):
+        # Only the account's own token is accepted for its feed
+        if request.url.path != f"/users/{POOL_LOGINS[token]}/events":
+            return httpx.Response(404)
+        return httpx.Response(200, json=[], headers={"X-Poll-Interval": "0"})
+    if request.url.path == "/graphql":
+        nodes = [
+            {"databaseId": id, "name": name, "nameWithOwner": f"{owner}/{name}", "owner": {"login": owner},
+             "primaryLanguage": None, "pushedAt": pushed_at}
+            for id, owner, name, pushed_at in repos
+        ]
+        listing = {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": nodes}
+        return httpx.Response(200, json={"data": {"owner": {"repositories": listing}}})
+    return httpx.Response(200, json=[
+        {"id": id, "name": name, "full_name": f"{owner}/{name}", "owner": {"login": owner},
+         "language": None, "pushed_at": pushed_at}
+        for id, owner, name, pushed_at in repos
+    ])
+
+
+async def test_token_pool():
+    """Listings from every pool account are merged by recency, without duplicates, on both backends."""
+    for backend in (GitHubClient, GitHubGraphQLClient):
+        async with backend(tokens=list(POOL_ACCOUNTS), transport=httpx.MockTransport(pool_handler)) as github:
+            assert [repo["name"] for repo in await github.get_repos(limit=2)] == ["b-new", "shared"]
+            assert [repo["name"] for repo in await github.get_repos()] == ["b-new", "shared", "a-old"]
+            # Repo-scoped requests go to a token that can see the repo
+            assert github.repo_tokens == {"alice/shared": 0, "alice/a-old": 0, "bob/b-new": 1}
+            # Every account's events feed is polled, each with its own token
+            assert await github.get_logins() == ["alice", "bob"]
+            assert await github.poll_events("alice") == await github.poll_events("bob") == []
+    print("✓ token pool: both accounts' repos merged by recency and deduplicated, every login's feed polled (REST and GraphQL)")
+
+
+async def test_coalesced_requests():
+    """Concurrent identical GETs share one request, but only within a priority lane."""
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"login": "me"})
+
+    async with GitHubClient(token="fake", transport=httpx.MockTransport(handler)) as github:
+        results = await asyncio.gather(*(github.get_page("/user") for _ in range(5)))
+        assert all(body == {"login": "me"} for body, _ in results)
+        assert github.request_stats["/user"] == {"issued": 1, "coalesced": 4}, github.request_stats
+
+        async def background():
+            with priority(BACKGROUND):
+                return await github.get_page("/user")
+
+        await asyncio.gather(background(), background(), github.get_page("/user"))
+        assert github.request_stats["/user"] == {"issued": 3, "coalesced": 5}, github.request_stats
+    print("✓ coalesced requests: 5 concurrent GETs issued once, lanes kept apart")
+
+
+async def test_graphql_backend():
+    """Batched GraphQL prefetch follows cursors, leaves failed repos to REST, and never fails a sync."""
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return graphql_handler(request)
+
+    async with GitHubGraphQLClient(token="fake", transport=httpx.MockTransport(handler)) as github:
+        repos = [{"id": i, "name": name, "owner": "me"} for i, name in enumerate(["long", "short", "gone", "bare"])]
+        await github.prefetch_commits(repos, datetime.now() - timedelta(days=30))
+        assert len(sent) == 2, len(sent)  # One batched query, one cursor follow-up for "long"
+        assert [c["sha"] for c in github._prefetched[("me", "long")]] == ["long-0", "long-1"]
+        assert github._prefetched[("me", "short")][0]["date"] == "2026-10-01T10:00:00Z"
+        assert github._prefetched[("me", "bare")] == []
+        assert ("me", "gone") not in github._prefetched  # Falls back to REST instead of an empty history
+
+    # fake_github serves no /graphql: every repo syncs over REST instead
+    async with serve_fake_github(FakeGitHubConfig(repos=3, commits=10, branches=1, days=20)) as (base_url, fake):
+        async with GitHubGraphQLClient(token="fake", base_url=base_url, max_retries=0) as github:
+            async with GitHubClient(token="fake", base_url=base_url) as rest:
+                repos = await rest.get_repos()
+            agent = CommitAgent(github, summarize=False)
+            await agent.sync_repos(repos)
+            assert all(len(agent.get_commits(repo["id"])) == 10 for repo in repos)
+    print("✓ graphql backend: batched heads + cursor pages, failed repos and queries fall back to REST")
+
+
+async def test_refresh_pipeline():
+    """A full refresh runs offline and only refetches pushed repos afterwards."""
+    async with serve_fake_github(FakeGitHubConfig(repos=20, commits=60)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False)
+            projects = await refresh(github, agent, limit=15)
+            assert len(projects) == 15
+            assert projects == sorted(projects, key=lambda p: p["weight"], reverse=True)
+
+            await asyncio.sleep(1)  # pushed_at has second resolution
+            repo_id = str(fake.repos[0]["id"])
+            cached = len(agent.get_commits(repo_id))
+            commit = fake.push(fake.repos[0]["name"])
+            requests = fake.requests
+            await refresh(github, agent, limit=15)
+            # Repo listing, then branches + new head lookup + commits for the pushed repo
+            assert fake.requests - requests == 4, fake.requests - requests
+            # Only the new commit was fetched and merged into the cached history
+            assert agent.get_commits(repo_id)[0]["sha"] == commit["sha"]
+            assert len(agent.get_commits(repo_id)) == cached + 1
+    print("✓ refresh pipeline: warm refresh only fetched the pushed repo, incrementally")
+
+
+async def test_events_sync():
+    """Quiet ticks cost only free 304s; pushes are merged from the events feed."""
+    config = FakeGitHubConfig(repos=10, commits=30, poll_interval=0)
+    async with serve_fake_github(config) as (base_url, fake):
+        fake.push(fake.repos[0]["name"])  # Give the feed a first event
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False)
+            await refresh(github, agent, limit=10)
+            assert await agent.sync_events([config.owner]) is None  # First poll primes the cursor
+
+            assert await agent.sync_events([config.owner]) == set()
+            requests, not_modified = fake.requests, fake.not_modified
+            assert await agent.sync_events([config.owner]) == set()
+            assert fake.requests - requests == fake.not_modified - not_modified == 1
+
+            repo = fake.repos[3]
+            commit = fake.push(repo["name"], "from the feed")
+            touched = await agent.sync_events([config.owner])
+            repo_id = str(repo["id"])
+            assert touched == {repo_id}, touched
+            assert agent.get_commits(repo_id)[0]["sha"] == commit["sha"]
+
+            # A commit authored days before its push is re-dated from the commit API
+            authored = datetime.now(timezone.utc) - timedelta(days=3)
+            commit = fake.push(repo["name"], "rebased work", authored=authored)
+            assert await agent.sync_events([config.owner]) == {repo_id}
+            cached = next(c for c in agent.get_commits(repo_id) if c["sha"] == commit["sha"])
+            assert parse_epoch(cached["date"]) == parse_epoch(commit["commit"]["author"]["date"]), cached["date"]
+            assert agent.get_commits(repo_id)[0]["sha"] != commit["sha"]
+            assert not agent._undated
+
+            # A push to a repo the cache does not hold (never listed or evicted) needs a listing
+            del agent.cache[repo_id]
+            fake.push(repo["name"], "while evicted")
+            assert await agent.sync_events([config.owner]) is None
+            await refresh(github, agent, limit=10)
+            assert agent.get_commits(repo_id)[0]["message"] == "while evicted"
+    print("✓ events sync: unchanged feed is one 304, pushes merged and re-dated without refetch, untracked pushes resync")
+
+
+async def test_webhook_push():
+    """A signed push updates that repo's row without any API calls."""
+    # The server works on module globals; every one the test sets is restored
+    saved = {name: getattr(server, name) for name in
+             ("commit_agent", "persister", "dashboard_data", "current_repos", "last_refresh")}
+    secret = os.environ.get("GITHUB_WEBHOOK_SECRET")
+    os.environ["GITHUB_WEBHOOK_SECRET"] = "test-secret"
+    tmp = tempfile.mkdtemp()
+    config = FakeGitHubConfig(repos=10, commits=30)
+    try:
+        async with serve_fake_github(config) as (base_url, fake):
+            async with GitHubClient(token="fake", base_url=base_url) as github:
+                server.commit_agent = CommitAgent(
+                    github, summarize=False, store=JsonCommitStore(os.path.join(tmp, "cache.json")),
+                    summary_cache=SummaryCache(os.path.join(tmp, "summaries.json")),
+                )
+                server.persister = CachePersister(server.commit_agent)
+                repos = await github.get_repos(limit=10)
+                await server.commit_agent.sync_repos(repos)
+                await server.publish_dashboard(repos)
+
+                repo = repos[-1]
+                before = next(p for p in server.dashboard_data["projects"] if p["project"] == repo["name"])
+                # Another owner's repo of the same name keeps its own row
+                namesake = {**before, "url": f"https://github.com/someone-else/{repo['name']}"}
+                server.dashboard_data["projects"].append(namesake)
+                requests = fake.requests
+                transport = httpx.ASGITransport(app=server.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://gitdash") as client:
+                    payload = push_payload(f"{config.owner}/{repo['name']}", repo["id"], ["one", "two"])
+                    response = await post_push(client, "test-secret", payload)
+                    assert response.json() == {"status": "updated", "repo_id": str(repo["id"])}, response.text
+
+                    # Pushes to a branch the board does not track are left to the next sync
+                    feature = push_payload(f"{config.owner}/{repo['name']}", repo["id"], ["wip"], ref="refs/heads/feature")
+                    response = await post_push(client, "test-secret", feature)
+                    assert response.json() == {"status": "unchanged"}, response.text
+
+                    response = await post_push(client, "wrong-secret", payload)
+                    assert response.status_code == 401, response.status_code
+
+                after = next(p for p in server.dashboard_data["projects"] if p["url"] == before["url"])
+                assert after["commit_count_3d"] == before["commit_count_3d"] + 2
+                assert namesake in server.dashboard_data["projects"]
+                assert fake.requests == requests
+    finally:
+        if server.persister is not saved["persister"]:
+            await server.persister.close()
+        for name, value in saved.items():
+            setattr(server, name, value)
+        if secret is None:
+            os.environ.pop("GITHUB_WEBHOOK_SECRET", None)
+        else:
+            os.environ["GITHUB_WEBHOOK_SECRET"] = secret
+    print("✓ webhook: signed push updated the row with zero API calls, other branches ignored")
+
+
+async def test_sqlite_store():
+    """The SQLite store round-trips the cache and only rewrites changed repos."""
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    async with serve_fake_github(FakeGitHubConfig(repos=10, commits=60)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, store=SqliteCommitStore(path))
+            await refresh(github, agent, limit=10)
+            agent.save_cache()
+
+            reloaded = CommitAgent(github, summarize=False, store=SqliteCommitStore(path))
+            statements = []
+            reloaded.store.reader.set_trace_callback(statements.append)
+            reloaded.load_cache()
+            reloaded.store.reader.set_trace_callback(None)
+            assert not any("commits" in statement for statement in statements), statements
+            # Commits stay on disk until accessed (counts come from the repos table),
+            # window counts from the index
+            repos = await github.get_repos(limit=10)
+            assert Board(repos, reloaded, as_of=agent.as_of).get_projects() == \
+                Board(repos, agent, as_of=agent.as_of).get_projects()
+            assert not any(entry["commits"].hydrated for entry in reloaded.cache.values())
+            assert reloaded.cache == agent.cache
+            assert reloaded.release_commits(keep=set()) == len(reloaded.cache)
+
+            # Reads on the loop never see a save in progress in the worker thread
+            repo_id, entry = next(iter(reloaded.cache.items()))
+            before = entry["commits"].count_since(0)
+            reloaded.store.conn.execute("DELETE FROM commits WHERE repo_id = ?", (repo_id,))  # Uncommitted
+            assert entry["commits"].count_since(0) == before and len(list(entry["commits"])) == before
+            reloaded.store.conn.rollback()
+
+            await asyncio.sleep(1)  # pushed_at has second resolution
+            fake.push(fake.repos[0]["name"])
+            await refresh(github, agent, limit=10)
+            assert agent.dirty == {str(fake.repos[0]["id"])}, agent.dirty
+            agent.save_cache()
+
+            # Indexed window counts agree with the Board's
+            repo = fake.repos[0]
+            board = Board([], agent, as_of=agent.as_of)
+            for days in (3, 30):
+                since = agent.as_of - timedelta(days=days)
+                expected = board._count_commits_in_window(agent.get_commits(repo["id"]), days)
+                assert agent.store.count_commits(repo["id"], since) == expected
+
+            # Stored counts follow saves; databases without the column are backfilled on open
+            agent.store.conn.execute("ALTER TABLE repos DROP COLUMN commit_count")
+            migrated = CommitAgent(github, summarize=False, store=SqliteCommitStore(path))
+            migrated.load_cache()
+            assert {repo_id: len(entry["commits"]) for repo_id, entry in migrated.cache.items()} == \
+                {repo_id: len(entry["commits"]) for repo_id, entry in agent.cache.items()}
+            migrated.store.close()
+    print("✓ sqlite store: lazy round-trip without reading commits, one dirty repo per push, indexed window counts")
+
+
+async def test_journal_store():
+    """The journal replays to the same cache, survives a torn tail and compacts."""
+    directory = tempfile.mkdtemp()
+    journal, snapshot = os.path.join(directory, "cache.journal"), os.path.join(directory, "cache.snapshot.json")
+    async with serve_fake_github(FakeGitHubConfig(repos=10, commits=60)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, store=JournalCommitStore(journal, snapshot))
+            await refresh(github, agent, limit=10)
+            agent.save_cache()
+
+            await asyncio.sleep(1)  # pushed_at has second resolution
+            fake.push(fake.repos[0]["name"])
+            await refresh(github, agent, limit=10)
+            size = os.path.getsize(journal)
+            with mock.patch("commit_store.os.fsync", side_effect=OSError("disk full")):
+                try:
+                    agent.save_cache()
+                    raise AssertionError("save did not fail")
+                except OSError:
+                    pass
+            assert os.path.getsize(journal) == size  # The failed batch was cut off
+            agent.save_cache()  # The retry still finds the changes to write
+            assert 0 < os.path.getsize(journal) - size < 1024  # One commit and a fetch stamp
+
+            with open(journal, "a") as f:
+                f.write('{"op":"repo","id":"1","na')  # Crash mid-append
+            reloaded = CommitAgent(github, summarize=False, store=JournalCommitStore(journal, snapshot))
+            reloaded.load_cache()
+            assert reloaded.cache == agent.cache
+
+            reloaded.store.compact()
+            assert os.path.getsize(journal) == 0
+            compacted = CommitAgent(github, summarize=False, store=JournalCommitStore(journal, snapshot))
+            compacted.load_cache()
+            assert compacted.cache == agent.cache
+    print("✓ journal store: O(delta) appends, failed saves retried, torn tail ignored, compaction round-trips")
+
+
+async def test_write_behind():
+    """Dirty marks coalesce into one off-loop save; flush writes what is pending."""
+    path = os.path.join(tempfile.mkdtemp(), "cache.json")
+    async with serve_fake_github(FakeGitHubConfig(repos=10, commits=60)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, store=JsonCommitStore(path))
+            persister = CachePersister(agent, delay=0.2)
+            persister.start()
+            await refresh(github, agent, limit=10)
+            for _ in range(5):
+                persister.mark_dirty()
+            await asyncio.sleep(0.5)
+            assert persister.stats["saves"] == 1 and persister.stats["coalesced"] == 4, persister.stats
+            assert not agent.dirty and os.path.exists(path)
+
+            await asyncio.sleep(1)  # pushed_at has second resolution
+            fake.push(fake.repos[0]["name"])
+            await refresh(github, agent, limit=10)
+            persister.mark_dirty()
+            await persister.close()  # Shutdown flushes without waiting out the debounce
+            assert persister.stats["saves"] == 2 and not persister.status()["pending"]
+
+            reloaded = CommitAgent(github, summarize=False, store=JsonCommitStore(path))
+            reloaded.load_cache()
+            assert reloaded.cache == agent.cache
+    print(f"✓ write-behind: coalesced saves, flushed on close, loop lag {persister.status()['max_loop_lag_ms']}ms")
+
+
+async def test_columnar_store():
+    """The columnar file round-trips through JSON and counts windows without parsing dates."""
+    directory = tempfile.mkdtemp()
+    async with serve_fake_github(FakeGitHubConfig(repos=10, commits=60)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, store=ColumnarCommitStore(os.path.join(directory, "cache.gdc")))
+            projects = await refresh(github, agent, limit=10)
+            agent.save_cache()
+
+            mapped = CommitAgent(github, summarize=False, store=ColumnarCommitStore(os.path.join(directory, "cache.gdc")))
+            mapped.load_cache()
+            assert mapped.cache == agent.cache
+            assert Board(await github.get_repos(limit=10), mapped, as_of=agent.as_of).get_projects() == projects
+
+            # Back to JSON and into a fresh columnar file
+            mapped.save_cache(os.path.join(directory, "cache.json"))
+            converted = ColumnarCommitStore(os.path.join(directory, "copy.gdc"))
+            converted.save(JsonCommitStore(os.path.join(directory, "cache.json")).load())
+            assert converted.load() == agent.cache
+    print("✓ columnar store: mapped load matches, JSON conversion round-trips")
+
+
+async def test_bounded_cache():
+    """Retention expires aged-out commits and evicts least recently read repos."""
+    path = os.path.join(tempfile.mkdtemp(), "cache.json")
+    async with serve_fake_github(FakeGitHubConfig(repos=10, commits=60)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, store=JsonCommitStore(path), max_repos=5)
+            repos = await github.get_repos(limit=10)
+            await agent.sync_repos(repos)
+            agent.save_cache()
+
+            board = {str(repo["id"]) for repo in repos[:3]}
+            Board(repos[:3], agent, as_of=agent.as_of).get_projects()
+            agent.trim_cache(board)
+            assert len(agent.cache) == 5 and board <= set(agent.cache)
+            assert agent.stats["evicted_repos"] == 5
+
+            agent.as_of += timedelta(days=20)
+            agent.trim_cache(board)
+            status = agent.cache_status()
+            assert status["expired_commits"] > 0 and status["misses"] == 0, status
+            assert board <= agent.dirty  # Expired commits are persisted too
+    print("✓ bounded cache: LRU eviction to max_repos, TTL expiry outside the window")
+
+
+async def test_concurrent_sync():
+    """Repos sync in parallel; a failing repo neither stalls nor breaks the others."""
+    async with serve_fake_github(FakeGitHubConfig(repos=10, commits=20, latency=0.1)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, sync_concurrency=10, repo_timeout=5)
+            repos = await github.get_repos(limit=10)
+            broken = repos[3]["name"]
+            fetch = agent._fetch_commits
+
+            async def flaky_fetch(repo, since):
+                if repo["name"] == broken:
+                    raise RuntimeError("boom")
+                return await fetch(repo, since)
+
+            agent._fetch_commits = flaky_fetch
+            start = asyncio.get_running_loop().time()
+            await agent.sync_repos(repos)
+            elapsed = asyncio.get_running_loop().time() - start
+            # Three sequential requests per repo; ten repos in series would take >= 3s
+            assert elapsed < 1.5, elapsed
+            # Entries land in input order whatever order the fetches finished in
+            assert list(agent.cache) == [str(repo["id"]) for repo in repos]
+            failed = agent.cache[str(repos[3]["id"])]
+            assert failed["summary"].startswith("Error") and failed["last_fetched"] is None
+            assert sum(bool(agent.get_commits(str(repo["id"]))) for repo in repos) == 9
+    print(f"✓ concurrent sync: 10 repos in {elapsed:.2f}s, one failure isolated")
+
+
+class SlowSummarizer:
+    """Stand-in for PolyAgent whose run() blocks like an LLM round trip."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.calls = 0
+
+    def run(self, prompt: str, **kwargs):
+        self.calls += 1
+        time.sleep(self.seconds)
+        return SimpleNamespace(has_data=lambda: True, data={"summary": f"summary {self.calls}"})
+
+
+async def test_background_summaries():
+    """Summaries run in worker threads; sync neither waits for them nor stalls the loop."""
+    async with serve_fake_github(FakeGitHubConfig(repos=6, commits=20)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            agent = CommitAgent(github, summarize=False, summary_concurrency=3)
+            agent.summarize, agent.ai = True, SlowSummarizer(0.3)
+            monitor = LoopLagMonitor(interval=0.01)
+            probe = asyncio.create_task(monitor.run())
+            repos = await github.get_repos(limit=6)
+
+            start = time.perf_counter()
+            await agent.sync_repos(repos)
+            synced = time.perf_counter() - start
+            assert synced < 0.3, synced  # Returned before a single summary finished
+            await agent.summaries.join()
+            probe.cancel()
+
+            assert agent.ai.calls == 6
+            assert all(agent.get_summary(repo["id"]).startswith("summary") for repo in repos)
+            assert monitor.max_lag < 0.1, monitor.max_lag
+            await agent.summaries.close()
+    print(f"✓ background summaries: sync returned in {synced:.2f}s, loop lag {monitor.max_lag * 1000:.2f}ms")
+
+
+async def test_summary_cache():
+    """Summaries are reused by commit content, across refetches and restarts."""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "summaries.json")
+    async with serve_fake_github(FakeGitHubConfig(repos=4, commits=20)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            store = JsonCommitStore(os.path.join(directory, "cache.json"))
+            agent = CommitAgent(github, summarize=False, store=store, summary_cache=SummaryCache(path))
+            agent.summarize, agent.ai = True, SlowSummarizer(0)
+            repos = await github.get_repos(limit=4)
+            await agent.sync_repos(repos)
+            await agent.summaries.join()
+            assert agent.ai.calls == 4
+            agent.save_cache()
+
+            # Evicted and refetched: same commits, same summaries, no calls
+            agent.cache.clear()
+            await agent.sync_repos(repos)
+            await agent.summaries.join()
+            assert agent.ai.calls == 4 and agent.summary_cache.stats["hits"] == 4
+            await agent.summaries.close()
+
+            # A push changes one repo's input; a restart keeps the others' summaries
+            fake.push(repos[0]["name"])
+            restarted = CommitAgent(github, summarize=False, store=store, summary_cache=SummaryCache(path, max_entries=4))
+            restarted.summarize, restarted.ai = True, SlowSummarizer(0)
+            restarted.load_cache()
+            restarted.cache.clear()
+            await restarted.sync_repos(repos)
+            await restarted.summaries.join()
+            assert restarted.ai.calls == 1, restarted.ai.calls
+            assert restarted.summary_cache.status() == {"hits": 3, "misses": 1, "evicted": 1, "entries": 4}
+            await restarted.summaries.close()
+    print("✓ summary cache: refetched and restarted repos reuse summaries, one call for the pushed repo")
+
+
+class BatchSummarizer(SlowSummarizer):
+    """Answers batched requests, leaving out the first repo of each batch."""
+
+    def run(self, prompt: str, schema_cls=None, **kwargs):
+        if schema_cls is not CommitSummaryBatch:
+            return super().run(prompt, **kwargs)
+        self.calls += 1
+        repo_ids = re.findall(r"^\[(\d+)\]", prompt, re.MULTILINE)
+        # Echo the ids as labeled in the prompt, brackets included, like a model would
+        summaries = [{"repo": f"[{repo_id}]", "summary": f"batched {repo_id}", "focus_areas": []} for repo_id in repo_ids[1:]]
+        return SimpleNamespace(has_data=lambda: True, data={"summaries": summaries})
+
+
+async def test_batched_summaries():
+    """Queued summaries share one request per batch, with per-repo fallback."""
+    async with serve_fake_github(FakeGitHubConfig(repos=12, commits=20)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            repos = await github.get_repos(limit=12)
+            cache = SummaryCache(os.path.join(tempfile.mkdtemp(), "summaries.json"))
+            agent = CommitAgent(github, summarize=False, summary_cache=cache, summary_concurrency=1, summary_batch=12)
+            agent.summarize, agent.ai = True, BatchSummarizer(0)
+            await agent.sync_repos(repos)
+            await agent.summaries.join()
+            # One batch for 12 repos plus one fallback call for the repo it left out
+            assert agent.ai.calls == 2, agent.ai.calls
+            batched = sum(agent.get_summary(repo["id"]).startswith("batched") for repo in repos)
+            assert batched == 11 and agent.summaries.stats["batch_fallbacks"] == 1
+            await agent.summaries.close()
+
+            # A small token budget splits the batch into several requests
+            cache = SummaryCache(os.path.join(tempfile.mkdtemp(), "summaries.json"))
+            agent = CommitAgent(github, summarize=False, summary_cache=cache, summary_concurrency=1,
+                                summary_batch=12, summary_batch_tokens=300)
+            agent.summarize, agent.ai = True, BatchSummarizer(0)
+            await agent.sync_repos(repos)
+            await agent.summaries.join()
+            stats = agent.summaries.stats
+            assert stats["batches"] > 1 and stats["llm_calls"] == stats["batches"] + stats["batch_fallbacks"], stats
+            assert all(agent.get_summary(repo["id"]) != "No summary available" for repo in repos)
+            await agent.summaries.close()
+    print(f"✓ batched summaries: 12 repos in 2 LLM calls, {stats['batches']} under a 300-token budget")
+
+
+class StallingSummarizer(SlowSummarizer):
+    """Blocks on the calls whose (1-based) numbers are in `stall`, answers the rest at once."""
+
+    def __init__(self, stall: set[int]):
+        super().__init__(0)
+        self.stall = stall
+        self.running = self.peak = 0  # Calls in flight, and the most at once
+        self.lock = threading.Lock()
+
+    def run(self, prompt: str, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.seconds = 0.5 if self.calls + 1 in self.stall else 0
+        try:
+            return super().run(prompt, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+async def test_summary_timeouts():
+    """A timed-out call keeps its thread, but neither starves the calls behind it nor replaces a good summary."""
+    async with serve_fake_github(FakeGitHubConfig(repos=4, commits=20)) as (base_url, fake):
+        async with GitHubClient(token="fake", base_url=base_url) as github:
+            cache = SummaryCache(os.path.join(tempfile.mkdtemp(), "summaries.json"))
+            agent = CommitAgent(github, summarize=False, summary_cache=cache, summary_concurrency=1, summary_timeout=0.2)
+            agent.summarize, agent.ai = True, StallingSummarizer(stall={1, 5})
+            repos = await github.get_repos(limit=4)
+            await agent.sync_repos(repos)
+            await agent.summaries.join()
+            summaries = [agent.get_summary(repo["id"]) for repo in repos]
+            # Only the stalled call timed out; the three queued behind it got their full
+            # timeout once its thread was free, and no extra thread was started meanwhile
+            assert agent.summaries.stats["timeouts"] == 1, summaries
+            assert sum(summary.startswith("summary") for summary in summaries) == 3, summaries
+            assert agent.ai.peak == 1 and agent.summaries.stats["abandoned"] == 0
+
+            good = next(str(repo["id"]) for repo in repos if agent.get_summary(repo["id"]).startswith("summary"))
+            agent.summary_cache.entries.clear()
+            agent.request_summary(good)  # Call 5 stalls too
+            await agent.summaries.join()
+            assert agent.summaries.stats["timeouts"] == 2
+            assert agent.get_summary(good).startswith("summary")  # Not "Summary generation timed out"
+            await agent.summaries.close()
+    print("✓ summary timeouts: one stalled call timed out alone, no threads beyond the pool, good summaries kept")
+
+
+async def main():
+    await test_pagination()
+    await test_conditional_requests()
+    await test_retries_transient_errors()
+    await test_exhausted_quota()
+    await test_circuit_probe_cancelled()
+    await test_token_pool()
+    await test_coalesced_requests()
+    await test_graphql_backend()
+    await test_refresh_pipeline()
+    await test_events_sync()
+    await test_webhook_push()
+    await test_sqlite_store()
+    await test_journal_store()
+    await test_write_behind()
+    await test_columnar_store()
+    await test_bounded_cache()
+    await test_concurrent_sync()
+    await test_background_summaries()
+    await test_summary_timeouts()
+    await test_summary_cache()
+    await test_batched_summaries()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
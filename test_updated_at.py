@@ -31,7 +31,8 @@ async def investigate_updated_at():
         owner="shuxueshuxue",
         repo="ink-and-memory",
         branch="main",
-        per_page=5
+        per_page=5,
+        limit=5
     )
     for commit in main_commits[:5]:
         print(f"  {commit['date']} - {commit['message'][:50]}")
@@ -44,7 +45,8 @@ async def investigate_updated_at():
         owner="shuxueshuxue",
         repo="ink-and-memory",
         branch="feature/deck-system",
-        per_page=5
+        per_page=5,
+        limit=5
     )
     for commit in feature_commits[:5]:
         print(f"  {commit['date']} - {commit['message'][:50]}")
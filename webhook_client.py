@@ -0,0 +1,87 @@
+"""
+Post signed GitHub push webhooks to a local GitDash server.
+
+    GITHUB_WEBHOOK_SECRET=dev uv run python webhook_client.py owner/repo 123456 "fix login bug"
+"""
+import hashlib
+import hmac
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+import httpx
+
+
+def sign(secret: str, body: bytes) -> str:
+    """X-Hub-Signature-256 value for a payload, as GitHub computes it."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def push_payload(full_name: str, repo_id: int, messages: list[str], ref: str = "refs/heads/main",
+                 default_branch: str = "main") -> dict:
+    """
+    Build a minimal push payload with one commit per message.
+
+    Args:
+        full_name: Repository as "owner/name"
+        repo_id: GitHub repository id (the dashboard's cache key)
+        messages: Commit messages, oldest first
+        ref: Pushed ref
+        default_branch: The repository's default branch
+
+    Returns:
+        Payload dict shaped like GitHub's push event
+    """
+    owner, name = full_name.split("/", 1)
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    commits = [
+        {
+            "id": hashlib.sha1(f"{full_name}:{message}:{uuid.uuid4()}".encode()).hexdigest(),
+            "message": message,
+            "timestamp": now,
+            "author": {"name": "webhook-client"},
+        }
+        for message in messages
+    ]
+    return {
+        "ref": ref,
+        "deleted": False,
+        "repository": {
+            "id": repo_id, "name": name, "full_name": full_name,
+            "owner": {"login": owner}, "default_branch": default_branch,
+        },
+        "commits": commits,
+        "head_commit": commits[-1] if commits else None,
+    }
+
+
+async def post_push(client: httpx.AsyncClient, secret: str, payload: dict,
+                    url: str = "/api/webhook/github") -> httpx.Response:
+    """Sign and deliver a push payload the way GitHub does."""
+    body = json.dumps(payload).encode()
+    return await client.post(url, content=body, headers={
+        "Content-Type": "application/json",
+        "X-GitHub-Event": "push",
+        "X-GitHub-Delivery": str(uuid.uuid4()),
+        "X-Hub-Signature-256": sign(secret, body),
+    })
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Send a signed push webhook to GitDash")
+    parser.add_argument("repo", help="Repository as owner/name")
+    parser.add_argument("repo_id", type=int, help="GitHub repository id")
+    parser.add_argument("messages", nargs="+", help="Commit messages")
+    parser.add_argument("--server", default="http://127.0.0.1:8000")
+    args = parser.parse_args()
+
+    async def _send():
+        async with httpx.AsyncClient(base_url=args.server) as client:
+            payload = push_payload(args.repo, args.repo_id, args.messages)
+            response = await post_push(client, os.environ["GITHUB_WEBHOOK_SECRET"], payload)
+            print(response.status_code, response.text)
+
+    asyncio.run(_send())